@@ -1,20 +1,49 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request, WebSocket, WebSocketDisconnect, Depends
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional, List, Dict
-import requests
-import time
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional, List, Dict, Tuple, Callable, AsyncIterator
+from urllib.parse import urlencode
+import asyncio
+import contextvars
+import csv
+import gzip
+import mimetypes
+import random
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from contextvars import ContextVar
+import aiofiles
+import httpx
+import av
+import numpy as np
+import websockets
+from prometheus_client import Counter, Histogram, CONTENT_TYPE_LATEST, generate_latest
 import os
 import uuid
 import json
-from datetime import datetime
+import math
+import hashlib
+import io
+import re
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
 from dotenv import load_dotenv
 
-# Import CrewAI components
-from crewai import Agent, Task, Crew, Process
-from langchain_openai import ChatOpenAI
+try:
+    import brotli
+except ImportError:  # optional: assets are then precompressed with gzip only
+    brotli = None
+
+# CrewAI and langchain_openai take seconds to import; they are loaded on first use
+# (or by the startup warmup, see load_ai_stack) so the pages and /api/config come up at once
 
 # =====================================================================================
 # CONFIGURATION
@@ -36,32 +65,137 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
-os.makedirs("static", exist_ok=True)
-os.makedirs("static/css", exist_ok=True)
-os.makedirs("static/js", exist_ok=True)
-os.makedirs("templates", exist_ok=True)
-os.makedirs("temp_audio", exist_ok=True)
-
-app.mount("/static", StaticFiles(directory="static"), name="static")
-
 # API Keys (load from environment or use defaults from app.py)
 #2. Fetch Keys
 ASSEMBLYAI_API_KEY = os.getenv("ASSEMBLYAI_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+OPENAI_MODEL = "gpt-4o"
+
 # 3. CRITICAL FIX: Explicitly set os.environ for CrewAI/LiteLLM
 # CrewAI strictly checks os.environ, not just the argument passed to the Agent
 if OPENAI_API_KEY:
     os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
     # Set default model name for CrewAI to avoid fallback errors
-    os.environ["OPENAI_MODEL_NAME"] = "gpt-4o"
+    os.environ["OPENAI_MODEL_NAME"] = OPENAI_MODEL
 else:
     print("⚠️ WARNING: OPENAI_API_KEY not found in environment variables.")
 
 if not ASSEMBLYAI_API_KEY:
     print("⚠️ WARNING: ASSEMBLYAI_API_KEY not found in environment variables.")
 
+# AssemblyAI endpoint and connection pool settings (override the base URL to point at a local stand-in)
+ASSEMBLYAI_BASE_URL = os.getenv("ASSEMBLYAI_BASE_URL", "https://api.assemblyai.com").rstrip("/")
+ASSEMBLYAI_MAX_CONNECTIONS = int(os.getenv("ASSEMBLYAI_MAX_CONNECTIONS", "50"))
+ASSEMBLYAI_POLL_INITIAL_DELAY = float(os.getenv("ASSEMBLYAI_POLL_INITIAL_DELAY", "0.25"))
+ASSEMBLYAI_POLL_MAX_DELAY = float(os.getenv("ASSEMBLYAI_POLL_MAX_DELAY", "3.0"))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Webhook completion: when a public URL is configured AssemblyAI calls us back instead of being polled.
+# Waiters live in one process, so this needs a single worker: a callback delivered to another worker
+# wakes nobody and the request waits for the safety poll. The secret is required (checked at startup)
+PUBLIC_BASE_URL = os.getenv("PUBLIC_BASE_URL", "").rstrip("/")
+ASSEMBLYAI_WEBHOOK_SECRET = os.getenv("ASSEMBLYAI_WEBHOOK_SECRET", "")
+ASSEMBLYAI_WEBHOOK_HEADER = "X-Webhook-Secret"
+ASSEMBLYAI_WEBHOOK_SAFETY_POLL = float(os.getenv("ASSEMBLYAI_WEBHOOK_SAFETY_POLL", "15"))
+
+# Audio preprocessing before upload: decode, downmix to mono, resample, trim leading/trailing
+# silence with an energy VAD and re-encode ("opus" in Ogg, or lossless "flac")
+AUDIO_NORMALIZE = os.getenv("AUDIO_NORMALIZE", "true").lower() == "true"
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_ENCODE_CODEC = os.getenv("AUDIO_ENCODE_CODEC", "opus")
+AUDIO_OPUS_BITRATE = int(os.getenv("AUDIO_OPUS_BITRATE", "24000"))
+AUDIO_VAD_FRAME_MS = 30
+AUDIO_VAD_THRESHOLD_DB = float(os.getenv("AUDIO_VAD_THRESHOLD_DB", "-45"))
+AUDIO_VAD_DYNAMIC_RANGE_DB = float(os.getenv("AUDIO_VAD_DYNAMIC_RANGE_DB", "40"))
+AUDIO_VAD_PADDING = float(os.getenv("AUDIO_VAD_PADDING", "0.3"))
+
+# Rule-based extraction for structured fields (dates, numbers, phones, emails, addresses);
+# answers below the confidence bar fall back to the CrewAI extractor
+FAST_PATH_EXTRACTION = os.getenv("FAST_PATH_EXTRACTION", "true").lower() == "true"
+FAST_PATH_MIN_CONFIDENCE = float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.9"))
+
+# Live transcription over WebSocket: "assemblyai" (real-time API) or "local" (scripted stand-in for tests)
+STREAMING_STT_BACKEND = os.getenv("STREAMING_STT_BACKEND", "assemblyai")
+ASSEMBLYAI_STREAMING_URL = os.getenv("ASSEMBLYAI_STREAMING_URL", "wss://streaming.assemblyai.com/v3/ws")
+LOCAL_STT_TRANSCRIPT = os.getenv("LOCAL_STT_TRANSCRIPT", "The inspector is John Smith.")
+LIVE_FINAL_TIMEOUT = float(os.getenv("LIVE_FINAL_TIMEOUT", "10"))
+
+# Transcript cache: in-memory LRU tier plus an optional SQLite tier (set TRANSCRIPT_CACHE_DB to enable it)
+TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.getenv("TRANSCRIPT_CACHE_MAX_ENTRIES", "512"))
+TRANSCRIPT_CACHE_DB = os.getenv("TRANSCRIPT_CACHE_DB", "")
+TRANSCRIPT_CACHE_TTL = float(os.getenv("TRANSCRIPT_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Memoized LLM stage results (translation / extraction / Q&A analysis)
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+
+# Retained Q&A recordings (for retries): evicted least recently used first once they exceed
+# AUDIO_STORE_MAX_BYTES, or when unused for AUDIO_STORE_TTL seconds
+AUDIO_STORE_DIR = "temp_audio"
+AUDIO_STORE_MAX_BYTES = int(os.getenv("AUDIO_STORE_MAX_BYTES", str(1024 * 1024 * 1024)))
+AUDIO_STORE_TTL = float(os.getenv("AUDIO_STORE_TTL", str(24 * 3600)))
+AUDIO_STORE_SWEEP_INTERVAL = float(os.getenv("AUDIO_STORE_SWEEP_INTERVAL", "300"))
+
+# Saved forms and Q&A analyses (SQLite, WAL mode)
+SESSION_DB = os.getenv("SESSION_DB", "sessions.db")
+SESSION_PAGE_MAX = 200
+
+# Batch Q&A processing: answers processed at once per batch request (clients may ask for fewer)
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
+# Background jobs: worker count, queue depth (submissions beyond it get 503) and how long results are kept
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))
+
+# Threads shared by concurrently running crew stages
+CREW_STAGE_WORKERS = int(os.getenv("CREW_STAGE_WORKERS", "16"))
+
+# Import the AI stack and prebuild the crews in the background at startup, so the first
+# audio request does not pay for it (set to false to load everything on first use instead)
+AI_WARMUP = os.getenv("AI_WARMUP", "true").lower() == "true"
+
+# Pages and /static assets are served from memory with precompressed variants and strong ETags.
+# ASSET_RELOAD re-reads files whose mtime changed (development); static assets are otherwise
+# cached by browsers for ASSET_MAX_AGE seconds, pages are always revalidated
+ASSET_RELOAD = os.getenv("ASSET_RELOAD", "false").lower() == "true"
+ASSET_MAX_AGE = int(os.getenv("ASSET_MAX_AGE", "3600"))
+ASSET_COMPRESS_MIN_BYTES = 512
+ASSET_DIRECTORIES = ["templates", "static"]
+
+# Upstream rate and concurrency limits shared by every worker process on the host (SQLite state
+# in UPSTREAM_LIMITS_DB): requests per second (token bucket, bursts of one second's worth) and
+# requests in flight per endpoint. Override as e.g. OPENAI_CHAT_RATE / OPENAI_CHAT_CONCURRENCY.
+# A 429 pauses the endpoint for Retry-After and halves its rate, which then recovers on success
+UPSTREAM_LIMITS_DB = os.getenv("UPSTREAM_LIMITS_DB", "upstream_limits.db")
+UPSTREAM_LIMITS = {
+    name: (float(os.getenv(f"{name.upper()}_RATE", rate)), int(os.getenv(f"{name.upper()}_CONCURRENCY", concurrency)))
+    for name, rate, concurrency in [
+        ("assemblyai_upload", 5, 10),
+        ("assemblyai_transcript", 5, 20),
+        ("assemblyai_poll", 20, 50),
+        ("openai_chat", 8, 16),
+    ]
+}
+UPSTREAM_LEASE_TTL = 600  # an in-flight slot held longer than this (crashed worker) is reclaimed
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "3"))
+UPSTREAM_RETRY_BASE_DELAY = float(os.getenv("UPSTREAM_RETRY_BASE_DELAY", "0.5"))
+UPSTREAM_RETRY_MAX_DELAY = float(os.getenv("UPSTREAM_RETRY_MAX_DELAY", "20"))
+
+# End-to-end request deadline in seconds, from the X-Request-Timeout header or a `timeout` form
+# field (capped at REQUEST_DEADLINE_MAX), else REQUEST_DEADLINE. A stage may use at most its share
+# of the whole deadline (override as e.g. ASSEMBLYAI_TRANSCRIPT_BUDGET=0.5), and never more than
+# what is left. Background jobs get the deadline of the request that queued them
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "120"))
+REQUEST_DEADLINE_MAX = float(os.getenv("REQUEST_DEADLINE_MAX", "600"))
+REQUEST_DEADLINE_HEADER = "X-Request-Timeout"
+STAGE_BUDGETS = {
+    stage: float(os.getenv(f"{stage.upper()}_BUDGET", share))
+    for stage, share in [("assemblyai_upload", 0.3), ("assemblyai_transcript", 0.6), ("crew", 0.6)]
+}
+
 # Predefined fields for Real Estate House Inspections
 PREDEFINED_INSPECTION_FIELDS = [
     {"id": "inspector_name", "name": "Inspector Name"},
@@ -100,160 +234,2251 @@ class ExtractionResponse(BaseModel):
     field_value: str
     translated_text: str
 
+class FormFieldSpec(BaseModel):
+    id: str
+    name: str
+
 class QnAProcessResponse(BaseModel):
     summary: str
     relevancy_score: str
 
 # =====================================================================================
-# HELPER FUNCTIONS
+# INSTRUMENTATION
 # =====================================================================================
 
-def poll_assemblyai_for_result(transcript_id: str, headers: dict):
-    """Poll AssemblyAI for transcription result"""
-    polling_endpoint = f'https://api.assemblyai.com/v2/transcript/{transcript_id}'
-    while True:
+STAGE_SECONDS = Histogram(
+    "voice_assistant_stage_seconds", "Latency of pipeline stages (uploads, polls, crew runs, saves)", ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+)
+REQUEST_SECONDS = Histogram(
+    "voice_assistant_request_seconds", "HTTP request latency", ["method", "route", "status"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+)
+UPSTREAM_ERRORS = Counter("voice_assistant_upstream_errors_total", "Failed upstream calls", ["upstream", "stage"])
+UPSTREAM_RETRIES = Counter("voice_assistant_upstream_retries_total", "Retried upstream calls", ["upstream", "stage"])
+
+# Stage timings of the request being handled; None outside HTTP requests (background jobs, sweeps)
+request_timings: ContextVar[Optional[List]] = ContextVar("request_timings", default=None)
+
+@contextmanager
+def stage_timer(stage: str, upstream: Optional[str] = None):
+    """
+    Time a block into the stage histogram and the current request's Server-Timing header.
+    When `upstream` names a remote service, exceptions are also counted as upstream errors.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        if upstream:
+            UPSTREAM_ERRORS.labels(upstream, stage).inc()
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.labels(stage).observe(elapsed)
+        timings = request_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+def server_timing_header(timings: List, total: float) -> str:
+    """Server-Timing value with repeated stages (e.g. polls) summed into one entry"""
+    totals: Dict[str, List] = {}
+    for stage, elapsed in timings:
+        entry = totals.setdefault(stage, [0.0, 0])
+        entry[0] += elapsed
+        entry[1] += 1
+    parts = [f'{stage};dur={elapsed * 1000:.1f}' + (f';desc="{count} calls"' if count > 1 else "")
+             for stage, (elapsed, count) in totals.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+class ServerTimingMiddleware:
+    """Collect stage timings per HTTP request, report them as Server-Timing and record request latency"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings = []
+        token = request_timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = server_timing_header(timings, time.perf_counter() - start)
+                message = {**message, "headers": [*message.get("headers", []),
+                                                  (b"server-timing", header.encode("latin-1"))]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_SECONDS.labels(scope["method"], route, str(status)).observe(time.perf_counter() - start)
+
+app.add_middleware(ServerTimingMiddleware)
+
+# =====================================================================================
+# DEADLINES
+# =====================================================================================
+
+class DeadlineExceeded(HTTPException):
+    """504 raised when a stage runs out of time, or the request is cancelled, naming the stage"""
+
+    def __init__(self, stage: str, detail: str):
+        super().__init__(status_code=504, detail=detail, headers={"X-Deadline-Stage": stage})
+        self.stage = stage
+
+class Deadline:
+    """
+    Time limit of a request, or of one stage within it (a child never outlives its parent).
+    Cancelling a deadline (client gone, budget spent) also cancels every stage under it;
+    work running in threads notices at its next check().
+    """
+
+    def __init__(self, seconds: float, stage: str = "request", parent: Optional["Deadline"] = None):
+        self.stage = stage
+        self.parent = parent
+        self.started_at = time.monotonic()
+        self._cancel_reason: Optional[str] = None
+        self.set_limit(seconds)
+
+    def set_limit(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = self.started_at + seconds
+        if self.parent is not None:
+            self.expires_at = min(self.expires_at, self.parent.expires_at)
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def cancel(self, reason: str):
+        self._cancel_reason = self._cancel_reason or reason
+
+    @property
+    def cancel_reason(self) -> Optional[str]:
+        if self._cancel_reason:
+            return self._cancel_reason
+        return self.parent.cancel_reason if self.parent is not None else None
+
+    def stage_deadline(self, stage: str, budget: Optional[str] = None) -> "Deadline":
+        """Child deadline for `stage`, limited to its share (STAGE_BUDGETS[budget]) of the request deadline"""
+        request = self
+        while request.parent is not None:
+            request = request.parent
+        share = STAGE_BUDGETS.get(budget or stage)
+        return Deadline(request.seconds * share if share else self.remaining(), stage, parent=self)
+
+    def exceeded(self) -> DeadlineExceeded:
+        if self.cancel_reason:
+            return DeadlineExceeded(self.stage, f"Cancelled during {self.stage}: {self.cancel_reason}")
+        parent = self.parent
+        if parent is not None and parent.expires_at <= self.expires_at:
+            while parent.parent is not None:
+                parent = parent.parent
+            return DeadlineExceeded(self.stage, f"Request deadline of {parent.seconds:g}s exceeded during {self.stage}")
+        return DeadlineExceeded(self.stage, f"{self.stage} ran out of its {self.seconds:.1f}s budget")
+
+    def check(self):
+        """Raise DeadlineExceeded if this deadline has passed or was cancelled"""
+        if self.cancel_reason or self.remaining() <= 0:
+            raise self.exceeded()
+
+# Deadline of the request (or the stage within it) being handled; None when unbounded
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+def request_timeout(value) -> float:
+    """Client-requested timeout in seconds, clamped to (0, REQUEST_DEADLINE_MAX]; the default if invalid"""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return REQUEST_DEADLINE
+    return min(seconds, REQUEST_DEADLINE_MAX) if seconds > 0 else REQUEST_DEADLINE
+
+async def within_budget(stage: str, awaitable, budget: Optional[str] = None):
+    """
+    Await `awaitable` under a child deadline for `stage`. When it runs out the awaitable is
+    cancelled (aborting in-flight upstream calls) and DeadlineExceeded names the stage.
+    """
+    parent = current_deadline.get()
+    if parent is None:
+        return await awaitable
+    deadline = parent.stage_deadline(stage, budget)
+    token = current_deadline.set(deadline)
+    try:
+        deadline.check()
+        return await asyncio.wait_for(awaitable, deadline.remaining())
+    except asyncio.TimeoutError:
+        # Threads started by this stage stop at their next check
+        deadline.cancel(f"{stage} timed out")
+        raise deadline.exceeded()
+    finally:
+        current_deadline.reset(token)
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()  # never started when the deadline had already passed
+
+@contextmanager
+def stage_deadline(stage: str, budget: Optional[str] = None):
+    """Synchronous within_budget for code running in threads: sets the child deadline and checks it up front"""
+    parent = current_deadline.get()
+    if parent is None:
+        yield None
+        return
+    deadline = parent.stage_deadline(stage, budget)
+    token = current_deadline.set(deadline)
+    try:
+        deadline.check()
+        yield deadline
+        # CrewAI turns errors (ours included) into a "stopped" answer, which must not pass as a result
+        deadline.check()
+    finally:
+        current_deadline.reset(token)
+
+async def form_deadline(timeout: Optional[float] = Form(None)):
+    """Route dependency: a `timeout` form field sets the request deadline like the header does"""
+    deadline = current_deadline.get()
+    if timeout is not None and deadline is not None:
+        deadline.set_limit(request_timeout(timeout))
+
+class DeadlineMiddleware:
+    """
+    Give each HTTP request a Deadline (X-Request-Timeout header, else REQUEST_DEADLINE) and
+    cancel the request, with everything it has in flight, when its client disconnects.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers", []))
+        deadline = Deadline(request_timeout(headers.get(REQUEST_DEADLINE_HEADER.lower().encode("latin-1"))))
+        token = current_deadline.set(deadline)
+        task = asyncio.current_task()
+        watcher: Optional[asyncio.Task] = None
+        responded = False
+
+        async def watch_for_disconnect():
+            # Only started once the body has been read, so it never takes a body message from the app
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    if not responded:
+                        deadline.cancel("client disconnected")
+                        task.cancel()
+                    return
+
+        async def receive_and_watch():
+            nonlocal watcher
+            message = await receive()
+            if message["type"] == "http.request" and not message.get("more_body") and watcher is None:
+                watcher = asyncio.create_task(watch_for_disconnect())
+            return message
+
+        async def send_and_track(message):
+            nonlocal responded
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                responded = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_and_watch, send_and_track)
+        except asyncio.CancelledError:
+            if not deadline.cancel_reason:
+                raise
+            # Nobody is left to answer; the cancellation already stopped the upstream work
+            if hasattr(task, "uncancel"):
+                task.uncancel()
+        finally:
+            current_deadline.reset(token)
+            if watcher is not None:
+                watcher.cancel()
+
+app.add_middleware(DeadlineMiddleware)
+
+# =====================================================================================
+# UPSTREAM LIMITS
+# =====================================================================================
+
+UPSTREAM_THROTTLED_SECONDS = Counter(
+    "voice_assistant_upstream_throttled_seconds_total", "Time spent waiting for an upstream slot", ["limit"]
+)
+UPSTREAM_RATE_LIMITED = Counter(
+    "voice_assistant_upstream_rate_limited_total", "Upstream 429 responses", ["limit"]
+)
+
+class UpstreamLimiter:
+    """
+    Token bucket plus in-flight cap per upstream endpoint, kept in SQLite so every
+    worker process draws from one budget. Each admitted request holds a lease row
+    until it finishes; leases of crashed workers expire after UPSTREAM_LEASE_TTL.
+    """
+
+    def __init__(self, db_path: str = UPSTREAM_LIMITS_DB, limits: Dict[str, Tuple[float, int]] = UPSTREAM_LIMITS):
+        self.db_path = db_path
+        self.limits = limits
+        # The database is created on first use, so importing the app leaves no file behind
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _create_schema(self, conn):
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""CREATE TABLE IF NOT EXISTS upstream_limits (
+            name TEXT PRIMARY KEY, max_rate REAL NOT NULL, rate REAL NOT NULL, concurrency INTEGER NOT NULL,
+            tokens REAL NOT NULL, updated_at REAL NOT NULL, blocked_until REAL NOT NULL DEFAULT 0,
+            throttled_seconds REAL NOT NULL DEFAULT 0, throttled_requests INTEGER NOT NULL DEFAULT 0,
+            requests INTEGER NOT NULL DEFAULT 0, rate_limited INTEGER NOT NULL DEFAULT 0)""")
+        conn.execute("""CREATE TABLE IF NOT EXISTS upstream_leases (
+            id TEXT PRIMARY KEY, name TEXT NOT NULL, expires_at REAL NOT NULL)""")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_upstream_leases_name ON upstream_leases (name, expires_at)")
+        # The latest configuration wins; adapted rates and counters survive restarts
+        for name, (rate, concurrency) in self.limits.items():
+            conn.execute("""INSERT INTO upstream_limits (name, max_rate, rate, concurrency, tokens, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET max_rate = excluded.max_rate,
+                    rate = MIN(rate, excluded.max_rate), concurrency = excluded.concurrency""",
+                         (name, rate, rate, concurrency, max(1.0, rate), time.time()))
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    self._create_schema(conn)
+                    self._schema_ready = True
+        conn.execute("PRAGMA synchronous=OFF")  # limiter state is disposable
+        return conn
+
+    def try_acquire(self, name: str) -> Tuple[Optional[str], float]:
+        """Take a slot if one is free: returns (lease id, 0), or (None, seconds to wait before trying again)"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            max_rate, rate, concurrency, tokens, updated_at, blocked_until = conn.execute(
+                "SELECT max_rate, rate, concurrency, tokens, updated_at, blocked_until FROM upstream_limits "
+                "WHERE name = ?", (name,)
+            ).fetchone()
+            tokens = min(max(1.0, max_rate), tokens + max(0.0, now - updated_at) * rate)
+            conn.execute("DELETE FROM upstream_leases WHERE name = ? AND expires_at < ?", (name, now))
+            in_flight = conn.execute("SELECT COUNT(*) FROM upstream_leases WHERE name = ?", (name,)).fetchone()[0]
+            lease, wait = None, 0.0
+            if blocked_until > now:
+                wait = blocked_until - now
+            elif in_flight >= concurrency:
+                wait = 0.05  # no cross-process wakeup; check again shortly
+            elif tokens < 1:
+                wait = (1 - tokens) / rate
+            else:
+                tokens -= 1
+                lease = uuid.uuid4().hex
+                conn.execute("INSERT INTO upstream_leases VALUES (?, ?, ?)", (lease, name, now + UPSTREAM_LEASE_TTL))
+            conn.execute("UPDATE upstream_limits SET tokens = ?, updated_at = ? WHERE name = ?", (tokens, now, name))
+            conn.execute("COMMIT")
+            return lease, wait
+        finally:
+            conn.close()
+
+    def release(self, name: str, lease: str, waited: float = 0.0, status: Optional[int] = None,
+                retry_after: Optional[float] = None):
+        """
+        Return a slot and record the outcome: a 429 pauses the endpoint (Retry-After, or one
+        second) and halves its rate; any other response recovers a tenth of the configured rate.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM upstream_leases WHERE id = ?", (lease,))
+            if status == 429:
+                conn.execute("""UPDATE upstream_limits SET rate = MAX(max_rate * 0.05, rate * 0.5),
+                    blocked_until = MAX(blocked_until, ?), rate_limited = rate_limited + 1 WHERE name = ?""",
+                             (now + (retry_after or 1.0), name))
+            elif status is not None:
+                conn.execute("UPDATE upstream_limits SET rate = MIN(max_rate, rate + max_rate * 0.1) WHERE name = ?",
+                             (name,))
+            conn.execute("""UPDATE upstream_limits SET requests = requests + 1,
+                throttled_seconds = throttled_seconds + ?, throttled_requests = throttled_requests + ?
+                WHERE name = ?""", (waited, int(waited > 0), name))
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def acquire_sync(self, name: str, deadline: Optional["Deadline"] = None) -> Tuple[str, float]:
+        """Block until a slot is free (or the deadline passes); returns the lease and the time spent waiting"""
+        start, throttled = time.perf_counter(), False
+        while True:
+            if deadline is not None:
+                deadline.check()
+            lease, wait = self.try_acquire(name)
+            if lease:
+                return lease, self._throttled(name, time.perf_counter() - start) if throttled else 0.0
+            throttled = True
+            time.sleep(wait * random.uniform(1.0, 1.2))
+
+    async def acquire(self, name: str) -> Tuple[str, float]:
+        start, throttled = time.perf_counter(), False
+        while True:
+            attempt = asyncio.ensure_future(run_in_threadpool(self.try_acquire, name))
+            try:
+                lease, wait = await asyncio.shield(attempt)
+            except asyncio.CancelledError:
+                # The thread commits its lease whether or not anyone is still waiting for it
+                attempt.add_done_callback(self._drop_abandoned_lease)
+                raise
+            if lease:
+                return lease, self._throttled(name, time.perf_counter() - start) if throttled else 0.0
+            throttled = True
+            await asyncio.sleep(wait * random.uniform(1.0, 1.2))
+
+    def drop_lease(self, lease: str):
+        """Return a slot without recording a request (the caller never sent one)"""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM upstream_leases WHERE id = ?", (lease,))
+        finally:
+            conn.close()
+
+    def _drop_abandoned_lease(self, attempt: asyncio.Future):
+        if attempt.cancelled() or attempt.exception() is not None:
+            return
+        lease, _ = attempt.result()
+        if lease:
+            asyncio.get_running_loop().run_in_executor(None, self.drop_lease, lease)
+
+    @staticmethod
+    def _throttled(name: str, waited: float) -> float:
+        # Record a wait in the metrics and in the current request's Server-Timing
+        UPSTREAM_THROTTLED_SECONDS.labels(name).inc(waited)
+        timings = request_timings.get()
+        if timings is not None:
+            timings.append((f"throttle_{name}", waited))
+        return waited
+
+    def stats(self) -> Dict:
+        now = time.time()
+        conn = self._connect()
         try:
-            polling_response = requests.get(polling_endpoint, headers=headers)
-            polling_response.raise_for_status()
-            polling_result = polling_response.json()
-            if polling_result['status'] in ['completed', 'error']:
+            rows = conn.execute("""SELECT l.name, max_rate, rate, concurrency, tokens, updated_at, blocked_until,
+                throttled_seconds, throttled_requests, requests, rate_limited,
+                (SELECT COUNT(*) FROM upstream_leases WHERE name = l.name AND expires_at >= ?)
+                FROM upstream_limits l ORDER BY l.name""", (now,)).fetchall()
+        finally:
+            conn.close()
+        return {
+            name: {
+                "max_rate": max_rate,
+                "rate": round(rate, 3),
+                "tokens": round(min(max(1.0, max_rate), tokens + max(0.0, now - updated_at) * rate), 3),
+                "concurrency": concurrency,
+                "in_flight": in_flight,
+                "blocked_for": round(max(0.0, blocked_until - now), 3),
+                "requests": requests,
+                "rate_limited": rate_limited,
+                "throttled_requests": throttled_requests,
+                "throttled_seconds": round(throttled_seconds, 3),
+            }
+            for (name, max_rate, rate, concurrency, tokens, updated_at, blocked_until, throttled_seconds,
+                 throttled_requests, requests, rate_limited, in_flight) in rows
+        }
+
+upstream_limiter = UpstreamLimiter()
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds (it may be a number of seconds or an HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def retry_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+    backoff = random.uniform(0, min(UPSTREAM_RETRY_MAX_DELAY, UPSTREAM_RETRY_BASE_DELAY * 2 ** attempt))
+    return max(backoff, retry_after or 0.0)
+
+def should_retry(response: Optional[httpx.Response], error: Optional[Exception], idempotent: bool) -> bool:
+    """
+    429s and connection failures never reached the upstream's handler, so any request may be
+    retried; 5xx responses and read timeouts only for requests that are safe to repeat.
+    """
+    if error is not None:
+        return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)) or (
+            idempotent and isinstance(error, httpx.TransportError))
+    return response.status_code == 429 or (idempotent and response.status_code in (500, 502, 503, 504))
+
+class LimitedStream(httpx.SyncByteStream):
+    """Response body that gives its limiter slot back when closed, so streamed replies hold it until done"""
+
+    def __init__(self, stream, release: Callable):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            release, self._release = self._release, None
+            if release:
+                release()
+
+class LimitedTransport(httpx.BaseTransport):
+    """httpx transport for the OpenAI SDK: every call goes through the shared limiter, with jittered retries"""
+
+    def __init__(self, limit: str, upstream: str = "openai"):
+        self.limit = limit
+        self.upstream = upstream
+        self._transport = httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        deadline = current_deadline.get()
+        for attempt in range(UPSTREAM_MAX_RETRIES + 1):
+            if deadline is not None:
+                # Runs in a crew thread, which cannot be cancelled: stop before each call instead,
+                # and let no call outlive the deadline
+                deadline.check()
+                remaining = max(0.001, deadline.remaining())
+                timeouts = request.extensions.get("timeout") or dict.fromkeys(("connect", "read", "write", "pool"))
+                request.extensions["timeout"] = {key: remaining if value is None else min(value, remaining)
+                                                 for key, value in timeouts.items()}
+            lease, waited = upstream_limiter.acquire_sync(self.limit, deadline)
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError as e:
+                upstream_limiter.release(self.limit, lease, waited)
+                if attempt == UPSTREAM_MAX_RETRIES or not should_retry(None, e, idempotent=True):
+                    raise
+                delay = retry_delay(attempt)
+            else:
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                if response.status_code == 429:
+                    UPSTREAM_RATE_LIMITED.labels(self.limit).inc()
+                if attempt == UPSTREAM_MAX_RETRIES or not should_retry(response, None, idempotent=True):
+                    release = lambda: upstream_limiter.release(self.limit, lease, waited, response.status_code,
+                                                               retry_after)
+                    return httpx.Response(status_code=response.status_code, headers=response.headers,
+                                          stream=LimitedStream(response.stream, release),
+                                          extensions=response.extensions)
+                response.close()
+                upstream_limiter.release(self.limit, lease, waited, response.status_code, retry_after)
+                delay = retry_delay(attempt, retry_after)
+            UPSTREAM_RETRIES.labels(self.upstream, self.limit).inc()
+            time.sleep(delay)
+
+    def close(self):
+        self._transport.close()
+
+# =====================================================================================
+# ASSEMBLYAI CLIENT
+# =====================================================================================
+
+class TranscriptWaiters:
+    """In-process registry of futures woken by AssemblyAI completion webhooks"""
+
+    def __init__(self, max_early: int = 1000):
+        self._futures: Dict[str, asyncio.Future] = {}
+        # Callbacks that arrive before the waiter registers (fast transcripts)
+        self._early: "OrderedDict[str, str]" = OrderedDict()
+        self._max_early = max_early
+
+    def register(self, transcript_id: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        if transcript_id in self._early:
+            future.set_result(self._early.pop(transcript_id))
+        else:
+            self._futures[transcript_id] = future
+        return future
+
+    def discard(self, transcript_id: str):
+        self._futures.pop(transcript_id, None)
+
+    def resolve(self, transcript_id: str, status: str) -> bool:
+        """Wake the request waiting on `transcript_id`; returns False if nobody was waiting yet"""
+        future = self._futures.pop(transcript_id, None)
+        if future is None:
+            self._early[transcript_id] = status
+            while len(self._early) > self._max_early:
+                self._early.popitem(last=False)
+            return False
+        future.get_loop().call_soon_threadsafe(
+            lambda: future.done() or future.set_result(status)
+        )
+        return True
+
+    def __len__(self):
+        return len(self._futures)
+
+class AssemblyAIClient:
+    """Async AssemblyAI client sharing one keep-alive connection pool across requests"""
+
+    def __init__(self, base_url: str = ASSEMBLYAI_BASE_URL, max_connections: int = ASSEMBLYAI_MAX_CONNECTIONS,
+                 poll_initial_delay: float = ASSEMBLYAI_POLL_INITIAL_DELAY,
+                 poll_max_delay: float = ASSEMBLYAI_POLL_MAX_DELAY, poll_backoff: float = 1.5):
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.poll_initial_delay = poll_initial_delay
+        self.poll_max_delay = poll_max_delay
+        self.poll_backoff = poll_backoff
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Shared HTTP client, created on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections,
+                                    keepalive_expiry=60.0),
+                timeout=httpx.Timeout(30.0, read=120.0),
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def request(self, limit: str, method: str, url: str, idempotent: bool = True,
+                      retries: int = UPSTREAM_MAX_RETRIES, **kwargs) -> httpx.Response:
+        """
+        Send a request through the shared limiter `limit`, retrying 429s and transient failures
+        with jittered backoff (see should_retry). The last response is returned whatever its status.
+        """
+        for attempt in range(retries + 1):
+            lease, waited = await upstream_limiter.acquire(limit)
+            response, error, retry_after = None, None, None
+            try:
+                response = await self.http.request(method, url, **kwargs)
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+            except httpx.TransportError as e:
+                error = e
+            finally:
+                status = response.status_code if response is not None else None
+                # Shielded so a cancelled request still hands its slot back
+                await asyncio.shield(run_in_threadpool(
+                    upstream_limiter.release, limit, lease, waited, status, retry_after
+                ))
+            if status == 429:
+                UPSTREAM_RATE_LIMITED.labels(limit).inc()
+            if attempt == retries or not should_retry(response, error, idempotent):
+                if error is not None:
+                    raise error
+                return response
+            UPSTREAM_RETRIES.labels("assemblyai", limit).inc()
+            await asyncio.sleep(retry_delay(attempt, retry_after))
+
+    async def upload(self, api_key: str, content) -> str:
+        """Upload audio bytes (or an async byte iterator) and return the upload URL"""
+        try:
+            with stage_timer("assemblyai_upload", upstream="assemblyai"):
+                # A streamed body is consumed by the first attempt, so only bytes are retried
+                upload_response = await self.request(
+                    "assemblyai_upload", "POST", '/v2/upload', headers={'authorization': api_key}, content=content,
+                    retries=UPSTREAM_MAX_RETRIES if isinstance(content, bytes) else 0
+                )
+                upload_response.raise_for_status()
+                return upload_response.json()['upload_url']
+        except Exception as e:
+            raise upstream_error("Error uploading file", e)
+
+    async def submit(self, api_key: str, upload_url: str, language_preference: str = "auto",
+                     speaker_labels: bool = False, webhook_url: Optional[str] = None) -> str:
+        """Request a transcript for an uploaded file and return its ID"""
+        json_data = {
+            'audio_url': upload_url,
+            'punctuate': True,
+            'format_text': True,
+            'speech_model': 'nano'  # Fastest model (nano < best). Use 'best' for higher accuracy
+        }
+        
+        if speaker_labels:
+            json_data['speaker_labels'] = True
+            json_data['disfluencies'] = True
+        
+        if language_preference == 'auto':
+            json_data['language_detection'] = True
+        else:
+            json_data['language_code'] = language_preference
+
+        if webhook_url:
+            json_data['webhook_url'] = webhook_url
+            json_data['webhook_auth_header_name'] = ASSEMBLYAI_WEBHOOK_HEADER
+            json_data['webhook_auth_header_value'] = ASSEMBLYAI_WEBHOOK_SECRET
+
+        try:
+            with stage_timer("assemblyai_submit", upstream="assemblyai"):
+                # Not idempotent: a repeated submit would start (and bill) a second transcript
+                transcript_response = await self.request("assemblyai_transcript", "POST", '/v2/transcript',
+                                                         idempotent=False, json=json_data,
+                                                         headers={'authorization': api_key})
+                transcript_response.raise_for_status()
+                transcript_id = transcript_response.json().get('id')
+        except Exception as e:
+            raise upstream_error("Error requesting transcription", e)
+        if not transcript_id:
+            raise HTTPException(status_code=500, detail="AssemblyAI did not return a transcript ID")
+        return transcript_id
+
+    async def poll(self, transcript_id: str, headers: dict):
+        """Poll until the transcript completes, backing off between checks"""
+        delay = self.poll_initial_delay
+        while True:
+            try:
+                polling_result = await self.fetch(transcript_id, headers)
+            except HTTPException as e:
+                if e.status_code != 503:
+                    raise
+                # Polls still rate limited after their retries; the transcript is processing anyway
+                polling_result = None
+            if polling_result and polling_result['status'] in ['completed', 'error']:
                 return polling_result
-            time.sleep(1)  # Reduced from 3 to 1 second for faster checking
-        except requests.exceptions.RequestException as e:
+            await asyncio.sleep(delay)
+            delay = min(delay * self.poll_backoff, self.poll_max_delay)
+
+    async def fetch(self, transcript_id: str, headers: dict):
+        """Fetch a transcript once, retrying transient failures; raises HTTPException if they persist"""
+        try:
+            with stage_timer("assemblyai_poll", upstream="assemblyai"):
+                response = await self.request("assemblyai_poll", "GET", f'/v2/transcript/{transcript_id}',
+                                              headers=headers)
+                response.raise_for_status()
+                return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise upstream_error(f"Error polling transcript {transcript_id}", e)
+
+    async def wait_for_webhook(self, transcript_id: str, headers: dict):
+        """Wait for the completion webhook, with a sparse safety poll in case a callback is lost"""
+        future = transcript_waiters.register(transcript_id)
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(asyncio.shield(future), timeout=ASSEMBLYAI_WEBHOOK_SAFETY_POLL)
+                except asyncio.TimeoutError:
+                    pass
+                result = await self.fetch(transcript_id, headers)
+                if result['status'] in ['completed', 'error']:
+                    return result
+                future = transcript_waiters.register(transcript_id) if future.done() else future
+        finally:
+            transcript_waiters.discard(transcript_id)
+
+    async def transcribe(self, api_key: str, content, language_preference: str = "auto",
+                         speaker_labels: bool = False, on_upload: Optional[Callable[[str], None]] = None):
+        """
+        Upload, submit and wait for a transcript (webhook when configured, polling otherwise).
+        `on_upload` gets the upload URL as soon as the upload finishes, before submit or the wait can fail.
+        """
+        upload_url = await within_budget("assemblyai_upload", self.upload(api_key, content))
+        if on_upload is not None:
+            on_upload(upload_url)
+        return await self.transcribe_uploaded(api_key, upload_url, language_preference, speaker_labels)
+
+    async def transcribe_uploaded(self, api_key: str, upload_url: str, language_preference: str = "auto",
+                                  speaker_labels: bool = False):
+        """Submit and wait for a transcript of audio that is already uploaded"""
+        webhook_url = f"{PUBLIC_BASE_URL}/api/webhooks/assemblyai" if PUBLIC_BASE_URL else None
+        transcript_id = await within_budget("assemblyai_submit", self.submit(
+            api_key, upload_url, language_preference, speaker_labels, webhook_url=webhook_url
+        ))
+        headers = {'authorization': api_key}
+        with stage_timer("assemblyai_transcript_wait"):
+            if webhook_url:
+                wait = self.wait_for_webhook(transcript_id, headers)
+            else:
+                wait = self.poll(transcript_id, headers)
+            # A transcript stuck in "processing" is abandoned once the stage budget is spent
+            polling_result = await within_budget("assemblyai_transcript", wait)
+        return parse_transcript_result(polling_result)
+
+def upstream_error(action: str, error: Exception) -> HTTPException:
+    """HTTPException for a failed AssemblyAI call; a 429 that outlasted the retries becomes a 503"""
+    if isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429:
+        retry_after = parse_retry_after(error.response.headers.get("retry-after")) or 5
+        return HTTPException(status_code=503, detail=f"{action}: AssemblyAI is rate limiting requests",
+                             headers={"Retry-After": str(math.ceil(retry_after))})
+    return HTTPException(status_code=500, detail=f"{action}: {str(error)}")
+
+def parse_transcript_result(polling_result):
+    """Turn a finished AssemblyAI transcript into the API's transcription payload"""
+    if polling_result and polling_result['status'] == 'completed':
+        text = (polling_result.get('text') or '').strip()
+        if not text:
+            raise HTTPException(status_code=400, 
+                              detail="No speech detected in the audio. Please ensure you speak clearly.")
+        return {
+            "text": text,
+            "language_code": polling_result.get('language_code', 'en'),
+            "confidence": polling_result.get('confidence', 0.0)
+        }
+    elif polling_result:
+        error_msg = polling_result.get('error', 'Unknown transcription error')
+        raise HTTPException(status_code=500, detail=f"Transcription failed: {error_msg}")
+    else:
+        raise HTTPException(status_code=500, detail="Failed to get transcription result")
+
+transcript_waiters = TranscriptWaiters()
+assemblyai_client = AssemblyAIClient()
+
+# =====================================================================================
+# CACHES
+# =====================================================================================
+
+class LRUCache:
+    """Thread-safe LRU map bounded by entry count and optionally total size, with optional TTL"""
+
+    def __init__(self, max_entries: int, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, size, expires_at)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[2] is not None and entry[2] < time.monotonic()):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value, size: int = 0):
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, size, expires_at)
+            self.bytes += size
+            while len(self._data) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        # Caller holds the lock
+        _, size, _ = self._data.pop(key)
+        self.bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+class TranscriptCache:
+    """Content-addressed transcript cache keyed on the audio hash and transcription options"""
+
+    def __init__(self, max_entries: int = TRANSCRIPT_CACHE_MAX_ENTRIES, db_path: str = TRANSCRIPT_CACHE_DB,
+                 ttl: float = TRANSCRIPT_CACHE_TTL):
+        self.memory = LRUCache(max_entries, ttl=ttl)
+        self.db_path = db_path
+        self.ttl = ttl
+        self.disk_hits = 0
+        self.disk_misses = 0
+        if db_path:
+            with self._connect() as conn:
+                conn.execute("""CREATE TABLE IF NOT EXISTS transcripts (
+                    key TEXT PRIMARY KEY, text TEXT NOT NULL, language_code TEXT,
+                    confidence REAL, created_at REAL NOT NULL)""")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_transcripts_created ON transcripts (created_at)")
+
+    @staticmethod
+    def key(audio_digest: str, language_preference: str, speaker_labels: bool) -> str:
+        return f"{audio_digest}:{language_preference}:{int(bool(speaker_labels))}"
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def _disk_get(self, key: str):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT text, language_code, confidence FROM transcripts WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl)
+            ).fetchone()
+        if row is None:
             return None
+        return {"text": row[0], "language_code": row[1], "confidence": row[2]}
 
-def transcribe_audio(api_key: str, audio_file_path: str, language_preference: str = "auto", 
-                     speaker_labels: bool = False):
-    """Transcribe audio using AssemblyAI"""
-    headers = {'authorization': api_key}
+    def _disk_put(self, key: str, result: Dict):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?)",
+                         (key, result["text"], result["language_code"], result["confidence"], now))
+            conn.execute("DELETE FROM transcripts WHERE created_at < ?", (now - self.ttl,))
+
+    async def get(self, key: str) -> Optional[Dict]:
+        result = self.memory.get(key)
+        if result is None and self.db_path:
+            result = await run_in_threadpool(self._disk_get, key)
+            if result is None:
+                self.disk_misses += 1
+            else:
+                self.disk_hits += 1
+                self.memory.put(key, result)
+        return dict(result) if result else None
+
+    async def put(self, key: str, result: Dict):
+        self.memory.put(key, dict(result))
+        if self.db_path:
+            await run_in_threadpool(self._disk_put, key, result)
+
+    def stats(self) -> Dict:
+        return {
+            "memory": self.memory.stats(),
+            "disk": {"enabled": bool(self.db_path), "hits": self.disk_hits, "misses": self.disk_misses},
+        }
+
+transcript_cache = TranscriptCache()
+llm_cache = LRUCache(LLM_CACHE_MAX_ENTRIES, max_bytes=LLM_CACHE_MAX_BYTES, ttl=LLM_CACHE_TTL)
+
+def normalize_text(text: str) -> str:
+    return " ".join(str(text).split())
+
+def memoize_llm_stage(stage: str, language_code: str, text: str, compute, *extra: str, model: str = OPENAI_MODEL):
+    """Return the cached result of an LLM stage for this input, computing and storing it on a miss"""
+    raw_key = "\x1f".join([stage, model, (language_code or "").lower(), *extra, normalize_text(text)])
+    key = hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+    cached = llm_cache.get(key)
+    if cached is not None:
+        return cached
+    value = compute()
+    llm_cache.put(key, value, size=len(json.dumps(value, ensure_ascii=False).encode("utf-8")))
+    return value
+
+
+# =====================================================================================
+# SESSION STORE
+# =====================================================================================
+
+SESSION_EXPORT_COLUMNS = ["id", "kind", "filename", "created_at", "property_address", "inspector_name", "data"]
+
+def form_value(form_data: Dict, *names: str) -> Optional[str]:
+    """Value of a form field by name, ignoring case and spaces vs underscores"""
+    wanted = {name.lower().replace("_", " ") for name in names}
+    for key, value in form_data.items():
+        if str(key).lower().replace("_", " ").strip() in wanted and value:
+            return str(value).strip()
+    return None
+
+class SessionStore:
+    """Saved forms and Q&A analyses in SQLite (WAL mode), indexed for listing and search"""
+
+    def __init__(self, db_path: str = SESSION_DB):
+        self.db_path = db_path
+        # The database is created on first use, so importing the app leaves no file behind
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _create_schema(self, conn):
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY, kind TEXT NOT NULL, filename TEXT NOT NULL UNIQUE,
+            created_at REAL NOT NULL, property_address TEXT, inspector_name TEXT, data TEXT NOT NULL)""")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions (created_at, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_kind_created ON sessions (kind, created_at, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_address "
+                     "ON sessions (property_address COLLATE NOCASE)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_inspector "
+                     "ON sessions (inspector_name COLLATE NOCASE)")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    with conn:
+                        self._create_schema(conn)
+                    self._schema_ready = True
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _insert(self, kind: str, data: Dict, property_address: Optional[str], inspector_name: Optional[str]) -> Dict:
+        session_id = str(uuid.uuid4())
+        created_at = time.time()
+        prefix = "form_data" if kind == "form" else "qna_analysis"
+        # The id suffix keeps names unique when several sessions are saved in the same second
+        filename = f"{prefix}_{datetime.fromtimestamp(created_at).strftime('%Y%m%d_%H%M%S')}_{session_id[:8]}.json"
+        with self._connect() as conn:
+            conn.execute("INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (session_id, kind, filename, created_at, property_address, inspector_name,
+                          json.dumps(data, ensure_ascii=False)))
+        return {"id": session_id, "filename": filename, "created_at": created_at}
+
+    def _get(self, column: str, value: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT * FROM sessions WHERE {column} = ?", (value,)).fetchone()
+        return self._row(row, include_data=True) if row else None
+
+    def _page(self, filters: Dict, limit: int, cursor: Optional[str], include_data: bool) -> List[Dict]:
+        """Newest first, continuing after `cursor` ("<created_at>:<id>" of the last row seen)"""
+        clauses, params = [], []
+        if filters.get("kind"):
+            clauses.append("kind = ?")
+            params.append(filters["kind"])
+        if filters.get("address"):
+            clauses.append("property_address LIKE ? COLLATE NOCASE")
+            params.append(filters["address"].replace("%", "").replace("_", "") + "%")
+        if filters.get("inspector"):
+            clauses.append("inspector_name = ? COLLATE NOCASE")
+            params.append(filters["inspector"])
+        if filters.get("since") is not None:
+            clauses.append("created_at >= ?")
+            params.append(filters["since"])
+        if filters.get("until") is not None:
+            clauses.append("created_at < ?")
+            params.append(filters["until"])
+        if cursor:
+            created_at, _, session_id = cursor.partition(":")
+            clauses.append("(created_at < ? OR (created_at = ? AND id < ?))")
+            params.extend([float(created_at), float(created_at), session_id])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT * FROM sessions {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+                                (*params, limit)).fetchall()
+        return [self._row(row, include_data) for row in rows]
+
+    @staticmethod
+    def _row(row, include_data: bool) -> Dict:
+        item = {key: row[key] for key in row.keys() if key != "data"}
+        item["created_at_iso"] = datetime.fromtimestamp(row["created_at"]).isoformat(timespec="seconds")
+        if include_data:
+            item["data"] = json.loads(row["data"])
+        return item
+
+    @staticmethod
+    def cursor_for(item: Dict) -> str:
+        return f"{item['created_at']!r}:{item['id']}"
+
+    async def save(self, kind: str, data: Dict, property_address: Optional[str] = None,
+                   inspector_name: Optional[str] = None) -> Dict:
+        with stage_timer("session_save"):
+            return await run_in_threadpool(self._insert, kind, data, property_address, inspector_name)
+
+    async def get(self, session_id: str) -> Optional[Dict]:
+        return await run_in_threadpool(self._get, "id", session_id)
+
+    async def get_by_filename(self, filename: str) -> Optional[Dict]:
+        return await run_in_threadpool(self._get, "filename", filename)
+
+    async def page(self, filters: Dict, limit: int, cursor: Optional[str] = None,
+                   include_data: bool = False) -> List[Dict]:
+        return await run_in_threadpool(self._page, filters, limit, cursor, include_data)
+
+    async def iter_all(self, filters: Dict, batch_size: int = 500) -> AsyncIterator[Dict]:
+        """Every matching session, read in keyset-paginated batches so exports never load the whole table"""
+        cursor = None
+        while True:
+            rows = await self.page(filters, batch_size, cursor, include_data=True)
+            for row in rows:
+                yield row
+            if len(rows) < batch_size:
+                return
+            cursor = self.cursor_for(rows[-1])
+
+session_store = SessionStore()
+
+# =====================================================================================
+# AUDIO RETENTION
+# =====================================================================================
+
+class AudioStore:
+    """
+    Q&A recordings kept on disk so answers can be retried by id. Each entry remembers its
+    AssemblyAI upload URL; a background sweeper drops entries unused for longer than the TTL
+    and then the least recently used ones until the total size fits the quota. Background-job
+    uploads (job_*.wav) share the directory; the sweeper removes any older than the TTL, which
+    only happens when their job was lost with an earlier process.
+    """
+
+    def __init__(self, root: str = AUDIO_STORE_DIR, max_bytes: int = AUDIO_STORE_MAX_BYTES,
+                 ttl: float = AUDIO_STORE_TTL, sweep_interval: float = AUDIO_STORE_SWEEP_INTERVAL):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.total_bytes = 0
+        self.evictions = 0
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def path_for(self, file_id: str) -> str:
+        return os.path.join(self.root, f"qna_{file_id}.wav")
+
+    def job_path(self) -> str:
+        """A fresh path for a background job's upload, deleted by its pipeline"""
+        return os.path.join(self.root, f"job_{uuid.uuid4()}.wav")
+
+    def _index(self, file_id: str, size: int, last_used: float, upload_url: Optional[str] = None):
+        previous = self.entries.pop(file_id, None)
+        if previous:
+            self.total_bytes -= previous["size"]
+        self.entries[file_id] = {"path": self.path_for(file_id), "size": size, "last_used": last_used,
+                                 "upload_url": upload_url}
+        self.total_bytes += size
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        """Recordings already on disk (left by an earlier run), oldest first"""
+        found = []
+        for name in os.listdir(self.root):
+            if name.startswith("qna_") and name.endswith(".wav"):
+                stat = os.stat(os.path.join(self.root, name))
+                found.append((name[len("qna_"):-len(".wav")], stat.st_size, stat.st_mtime))
+        return sorted(found, key=lambda item: item[2])
+
+    def _stale_job_files(self) -> List[str]:
+        cutoff = time.time() - self.ttl
+        stale = []
+        for name in os.listdir(self.root):
+            if name.startswith("job_") and name.endswith(".wav"):
+                path = os.path.join(self.root, name)
+                try:
+                    if os.stat(path).st_mtime < cutoff:
+                        stale.append(path)
+                except FileNotFoundError:
+                    pass
+        return stale
+
+    async def add(self, file_id: str, upload_url: Optional[str] = None):
+        """Start tracking a recording written to path_for(file_id)"""
+        path = self.path_for(file_id)
+        if not os.path.exists(path):
+            return
+        self._index(file_id, os.path.getsize(path), time.time(), upload_url)
+        if self.total_bytes > self.max_bytes:
+            await self.sweep()
+
+    def remember_upload(self, file_id: str, upload_url: Optional[str]):
+        entry = self.entries.get(file_id)
+        if entry is not None and upload_url:
+            entry["upload_url"] = upload_url
+
+    def get(self, file_id: str) -> Optional[Dict]:
+        """The entry for a retained recording (marking it recently used), or None once evicted"""
+        entry = self.entries.get(file_id)
+        if entry is None:
+            return None
+        if not os.path.exists(entry["path"]):
+            self.total_bytes -= entry["size"]
+            del self.entries[file_id]
+            return None
+        entry["last_used"] = time.time()
+        self.entries.move_to_end(file_id)
+        return entry
+
+    def _evict(self) -> List[str]:
+        """Drop expired entries, then least recently used ones over the quota; returns their paths"""
+        now = time.time()
+        victims = [file_id for file_id, entry in self.entries.items() if now - entry["last_used"] > self.ttl]
+        total = self.total_bytes - sum(self.entries[file_id]["size"] for file_id in victims)
+        for file_id, entry in self.entries.items():
+            if total <= self.max_bytes:
+                break
+            if file_id not in victims:
+                victims.append(file_id)
+                total -= entry["size"]
+        paths = []
+        for file_id in victims:
+            entry = self.entries.pop(file_id)
+            self.total_bytes -= entry["size"]
+            paths.append(entry["path"])
+        self.evictions += len(paths)
+        return paths
+
+    @staticmethod
+    def _delete(paths: List[str]):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    async def sweep(self) -> int:
+        # Entries are chosen on the event loop; only the file deletes run in the threadpool
+        paths = self._evict()
+        if paths:
+            await run_in_threadpool(self._delete, paths)
+        stale = await run_in_threadpool(self._stale_job_files)
+        if stale:
+            await run_in_threadpool(self._delete, stale)
+        return len(paths) + len(stale)
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                removed = await self.sweep()
+                if removed:
+                    print(f"Audio store: evicted {removed} recordings")
+            except Exception as e:
+                print(f"Audio store sweep failed: {e}")
+
+    async def start(self):
+        for file_id, size, mtime in await run_in_threadpool(self._scan):
+            if file_id not in self.entries:
+                self._index(file_id, size, mtime)
+        await self.sweep()
+        self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def stop(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    def stats(self) -> Dict:
+        return {
+            "recordings": len(self.entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "evictions": self.evictions,
+        }
+
+audio_store = AudioStore()
+
+# =====================================================================================
+# AGENT / CREW REGISTRY
+# =====================================================================================
+
+# Crews are built once with {placeholders}; per-request text is passed as kickoff inputs
+
+ai_stack_lock = threading.Lock()
+ai_stack_loaded = False
+
+def load_ai_stack():
+    """Import CrewAI and langchain_openai once; the first call takes seconds, later calls are free"""
+    global ai_stack_loaded
+    if ai_stack_loaded:
+        return
+    with ai_stack_lock:
+        if not ai_stack_loaded:
+            with stage_timer("ai_stack_import"):
+                import crewai  # noqa: F401
+                import langchain_openai  # noqa: F401
+            ai_stack_loaded = True
+
+def build_translation_crew(llm):
+    from crewai import Agent, Task, Crew, Process
+    translator_agent = Agent(
+        role='Expert Language Translator',
+        goal='Translate text to English, but first verify if it is already English.',
+        backstory='An expert linguist who trusts text content over potentially incorrect language codes.',
+        llm=llm,
+        verbose=False,
+        allow_delegation=False
+    )
+    translation_task = Task(
+        description="Text: '{text}'. Detected language: '{language_code}'. If the text content is English, return it as is. Otherwise, translate to English.",
+        agent=translator_agent,
+        expected_output="The text in English."
+    )
+    return Crew(
+        agents=[translator_agent],
+        tasks=[translation_task],
+        process=Process.sequential
+    )
+
+def build_extraction_crew(llm):
+    from crewai import Agent, Task, Crew, Process
+    extractor_agent = Agent(
+        role='Information Extractor Agent',
+        goal="Extract the specific information for the form field: '{field_name}'. Output ONLY the value.",
+        backstory="An AI expert at parsing English text to fill forms accurately.",
+        verbose=False, llm=llm, allow_delegation=False
+    )
+    extraction_task = Task(
+        description="From the text: '{text}', extract the value for the field '{field_name}'.",
+        expected_output="The precise value for '{field_name}'.",
+        agent=extractor_agent
+    )
+    return Crew(
+        agents=[extractor_agent],
+        tasks=[extraction_task],
+        process=Process.sequential
+    )
+
+def build_multi_extraction_crew(llm):
+    from crewai import Agent, Task, Crew, Process
+    extractor_agent = Agent(
+        role='Information Extractor Agent',
+        goal='Extract the values for every requested form field from one dictation. Output ONLY JSON.',
+        backstory='An AI expert at parsing English text to fill forms accurately.',
+        verbose=False, llm=llm, allow_delegation=False
+    )
+    extraction_task = Task(
+        description="""From the text: '{text}', extract a value for each of these form fields (key: field name):
+        {field_list}
+        
+        Respond with ONLY a JSON object mapping each key to {{"value": "<extracted value>", "confidence": <0.0-1.0>}}.
+        Use an empty string and confidence 0 for fields the text does not mention.""",
+        expected_output="A JSON object with one value/confidence entry per field key.",
+        agent=extractor_agent
+    )
+    return Crew(
+        agents=[extractor_agent],
+        tasks=[extraction_task],
+        process=Process.sequential
+    )
+
+def build_qna_crew(llm, translate: bool = True):
+    """translate -> analyze -> (score, summarize); without `translate` the answer is analyzed as given"""
+    from crewai import Agent, Task, Crew, Process
+    translator_agent = Agent(
+        role='Expert Language Translator',
+        goal='Translate text to English, but first verify if it is already English.',
+        backstory='An expert linguist who trusts text content over potentially incorrect language codes.',
+        llm=llm
+    )
+    analyzer_agent = Agent(
+        role='Answer Relevance Analyzer',
+        goal='Analyze ENGLISH text for relevance to the question.',
+        backstory='Expert in linguistic analysis.',
+        llm=llm
+    )
+    relevancy_agent = Agent(
+        role='Answer Quality Scorer',
+        goal='Provide numerical scores (1-10) for answer quality.',
+        backstory='Professional evaluator.',
+        llm=llm
+    )
+    summarizer_agent = Agent(
+        role='Concise Summarizer',
+        goal='Summarize the key points of the ENGLISH answer.',
+        backstory='Professional editor.',
+        llm=llm
+    )
+    
+    translation_task = Task(
+        name='translate',
+        description="Text: '{answer}'. Detected language: '{language_code}'. If the text content is English, return it as is. Otherwise, translate to English.",
+        agent=translator_agent,
+        expected_output="The text in English."
+    )
+    if translate:
+        analysis_task = Task(
+            name='analyze',
+            description="Analyze this ENGLISH answer for the question: '{question}'.",
+            agent=analyzer_agent,
+            context=[translation_task],
+            expected_output="Key points and a conclusion on relevance."
+        )
+    else:
+        analysis_task = Task(
+            name='analyze',
+            description="Answer: '{answer}'. Analyze this ENGLISH answer for the question: '{question}'.",
+            agent=analyzer_agent,
+            context=[],
+            expected_output="Key points and a conclusion on relevance."
+        )
+    relevancy_task = Task(
+        name='score',
+        description="""Based on the analysis, score the answer's relevance, content match, completeness, and specificity from 1-10. 
+        
+        Format your response EXACTLY as bullet points like this:
+        • Relevance: [score] - [brief one-line explanation]
+        • Content Match: [score] - [brief one-line explanation]
+        • Completeness: [score] - [brief one-line explanation]
+        • Specificity: [score] - [brief one-line explanation]
+        
+        Example format:
+        • Relevance: 10 - The answer directly addresses the key features of the property.
+        • Content Match: 10 - The answer matches the expected content by providing details on bedrooms, washrooms, and upgrades.
+        • Completeness: 10 - The answer covers all necessary aspects such as size, layout, and upgrades.
+        • Specificity: 10 - The answer is specific, providing exact numbers and detailed information.
+        """,
+        agent=relevancy_agent,
+        context=[analysis_task],
+        expected_output="A bullet-point list with scores (1-10) for Relevance, Content Match, Completeness, and Specificity, each with a one-line explanation."
+    )
+    summary_task = Task(
+        name='summarize',
+        description="Create a concise, two-sentence summary of the user's response.",
+        agent=summarizer_agent,
+        context=[analysis_task],
+        expected_output="A polished two-sentence summary."
+    )
+    
+    if not translate:
+        return Crew(
+            agents=[analyzer_agent, relevancy_agent, summarizer_agent],
+            tasks=[analysis_task, relevancy_task, summary_task],
+            process=Process.sequential
+        )
+    return Crew(
+        agents=[translator_agent, analyzer_agent, relevancy_agent, summarizer_agent],
+        tasks=[translation_task, analysis_task, relevancy_task, summary_task],
+        process=Process.sequential
+    )
+
+class CrewRegistry:
+    """Process-wide pool of prebuilt LLM clients and crews.
+
+    LLM clients are built once per (model, temperature) and crews once per
+    (crew, model, temperature). A crew is checked out exclusively while it runs,
+    so concurrent requests grow the pool instead of sharing task state.
+    Everything is rebuilt when the OpenAI key changes.
+    """
+
+    def __init__(self, builders: Dict):
+        self._builders = builders
+        self._lock = threading.Lock()
+        self._api_key = None
+        self._llms = {}
+        self._idle = {}
+        self.crews_built = 0
+
+    def _sync_api_key(self):
+        # Caller holds the lock
+        if self._api_key != OPENAI_API_KEY:
+            self._llms.clear()
+            self._idle.clear()
+            self._api_key = OPENAI_API_KEY
+
+    def reset(self):
+        """Drop every cached client and crew"""
+        with self._lock:
+            self._llms.clear()
+            self._idle.clear()
+            self._api_key = None
+
+    def llm(self, model: str = OPENAI_MODEL, temperature: float = 0.1):
+        with self._lock:
+            self._sync_api_key()
+            key = (model, temperature)
+            if key not in self._llms:
+                from langchain_openai import ChatOpenAI
+                # OpenAI calls go through the shared limiter, which also owns retries
+                self._llms[key] = ChatOpenAI(
+                    api_key=self._api_key, model_name=model, temperature=temperature, max_retries=0,
+                    http_client=httpx.Client(transport=LimitedTransport("openai_chat"))
+                )
+            return self._llms[key]
+
+    @contextmanager
+    def checkout(self, name: str, model: str = OPENAI_MODEL, temperature: float = 0.1):
+        """Borrow a crew for one run, building it if none is idle"""
+        key = (name, model, temperature)
+        with self._lock:
+            self._sync_api_key()
+            api_key = self._api_key
+            idle = self._idle.get(key)
+            crew = idle.pop() if idle else None
+        if crew is None:
+            load_ai_stack()
+            crew = self._builders[name](self.llm(model, temperature))
+            self.crews_built += 1
+        try:
+            yield crew
+        finally:
+            with self._lock:
+                if self._api_key == api_key:
+                    self._idle.setdefault(key, []).append(crew)
+
+    def kickoff(self, name: str, inputs: Dict, model: str = OPENAI_MODEL, temperature: float = 0.1):
+        with self.checkout(name, model, temperature) as crew, stage_timer(f"crew_{name}", upstream="openai"), \
+                stage_deadline(f"crew_{name}", budget="crew"):
+            return crew.kickoff(inputs=inputs)
+
+    def run_graph(self, name: str, inputs: Dict, model: str = OPENAI_MODEL, temperature: float = 0.1):
+        """Like kickoff, but independent tasks run concurrently (see run_crew_graph)"""
+        with self.checkout(name, model, temperature) as crew, stage_timer(f"crew_{name}", upstream="openai"), \
+                stage_deadline(f"crew_{name}", budget="crew"):
+            return run_crew_graph(crew, inputs)
+
+crew_stage_pool = ThreadPoolExecutor(max_workers=CREW_STAGE_WORKERS, thread_name_prefix="crew-stage")
+
+def task_dependencies(tasks: List) -> Dict[int, List]:
+    """Map each task to the tasks it depends on, read from its `context`.
+
+    As in a sequential crew, a task without an explicit context depends on the
+    task before it.
+    """
+    dependencies = {}
+    for index, task in enumerate(tasks):
+        context = task.context if isinstance(task.context, list) else None
+        if context is None:
+            context = [tasks[index - 1]] if index else []
+        dependencies[id(task)] = context
+    return dependencies
+
+def task_levels(tasks: List) -> List[List]:
+    """Group tasks into levels; tasks in the same level only depend on earlier levels"""
+    dependencies = task_dependencies(tasks)
+    done, levels, remaining = set(), [], list(tasks)
+    while remaining:
+        ready = [task for task in remaining if all(id(dep) in done for dep in dependencies[id(task)])]
+        if not ready:
+            raise ValueError("Crew tasks have a dependency cycle or depend on a task outside the crew")
+        levels.append(ready)
+        done.update(id(task) for task in ready)
+        remaining = [task for task in remaining if id(task) not in done]
+    return levels
+
+def run_crew_graph(crew, inputs: Dict):
+    """Run a crew's tasks as a dependency graph, executing independent tasks concurrently.
+
+    Returns the task outputs in crew order and per-stage wall time in milliseconds.
+    Relies on Task.interpolate_inputs / execute_sync (CrewAI 0.51); on a CrewAI without them the
+    crew runs sequentially through kickoff instead, and no per-stage times are reported.
+    """
+    if not all(hasattr(task, "interpolate_inputs") and hasattr(task, "execute_sync") for task in crew.tasks):
+        crew.kickoff(inputs=inputs)
+        return [task.output for task in crew.tasks], {}
+    for task in crew.tasks:
+        task.interpolate_inputs(inputs)
+    for agent in crew.agents:
+        agent.interpolate_inputs(inputs)
+    
+    dependencies = task_dependencies(crew.tasks)
+    outputs, timings = {}, {}
     
+    def run_task(task):
+        start = time.perf_counter()
+        context = "\n\n----------\n\n".join(outputs[id(dep)].raw for dep in dependencies[id(task)])
+        with stage_timer(f"crew_task_{task.name or 'unnamed'}"):
+            output = task.execute_sync(agent=task.agent, context=context or None, tools=task.agent.tools)
+        timings[task.name or task.description[:40]] = round((time.perf_counter() - start) * 1000, 1)
+        return output
+    
+    for level in task_levels(crew.tasks):
+        if len(level) == 1:
+            outputs[id(level[0])] = run_task(level[0])
+            continue
+        # Each stage carries the caller's context so its timing lands in the request's Server-Timing
+        futures = [(task, crew_stage_pool.submit(contextvars.copy_context().run, run_task, task))
+                   for task in level]
+        for task, future in futures:
+            outputs[id(task)] = future.result()
+    
+    return [outputs[id(task)] for task in crew.tasks], timings
+
+crew_registry = CrewRegistry({
+    "translation": build_translation_crew,
+    "extraction": build_extraction_crew,
+    "multi_extraction": build_multi_extraction_crew,
+    "qna": build_qna_crew,
+    "qna_english": lambda llm: build_qna_crew(llm, translate=False),
+})
+
+# Crews prebuilt by the startup warmup, at the temperatures the request paths use
+WARMUP_CREWS = [("translation", 0.1), ("extraction", 0.1), ("multi_extraction", 0.1), ("qna", 0.2),
+                ("qna_english", 0.2)]
+
+def warm_ai_stack():
+    """Import the AI stack and leave one idle crew of each kind in the registry"""
     try:
-        with open(audio_file_path, 'rb') as f:
-            upload_response = requests.post('https://api.assemblyai.com/v2/upload', 
-                                           headers=headers, data=f)
-        upload_response.raise_for_status()
-        upload_url = upload_response.json()['upload_url']
+        load_ai_stack()
+        if OPENAI_API_KEY:
+            for name, temperature in WARMUP_CREWS:
+                with crew_registry.checkout(name, temperature=temperature):
+                    pass
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error uploading file: {str(e)}")
+        print(f"⚠️ WARNING: AI warmup failed, loading on first use instead: {e}")
+
+# =====================================================================================
+# AUDIO PREPROCESSING
+# =====================================================================================
+
+AUDIO_ENCODINGS = {"opus": ("ogg", "libopus"), "flac": ("flac", "flac")}
+
+def iter_mono_blocks(source, sample_rate: int = AUDIO_SAMPLE_RATE):
+    """Decode any container/codec PyAV understands into mono int16 blocks at sample_rate, one decoded frame at a time"""
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+    # Explicit mode: PyAV otherwise takes it from file.mode, which is "w+b" for spooled uploads
+    with av.open(source, mode="r") as container:
+        for frame in container.decode(container.streams.audio[0]):
+            for out in resampler.resample(frame):
+                yield out.to_ndarray().reshape(-1)
+    for out in resampler.resample(None):
+        yield out.to_ndarray().reshape(-1)
+
+def spool_blocks(blocks, file):
+    """Pass blocks through while writing their raw samples to file"""
+    for block in blocks:
+        file.write(block.tobytes())
+        yield block
 
-    json_data = {
-        'audio_url': upload_url,
-        'punctuate': True,
-        'format_text': True,
-        'speech_model': 'nano'  # Fastest model (nano < best). Use 'best' for higher accuracy
+def frame_energies(blocks, sample_rate: int = AUDIO_SAMPLE_RATE) -> Tuple[np.ndarray, int]:
+    """Energy in dB of each AUDIO_VAD_FRAME_MS frame, and the total sample count, computed block by block"""
+    frame_size = sample_rate * AUDIO_VAD_FRAME_MS // 1000
+    energies, carry, total = [], np.zeros(0, dtype=np.int16), 0
+    for block in blocks:
+        total += len(block)
+        block = np.concatenate([carry, block]) if len(carry) else block
+        count = len(block) // frame_size
+        if count:
+            frames = block[:count * frame_size].astype(np.float32).reshape(count, frame_size) / 32768.0
+            energies.append(np.mean(frames ** 2, axis=1))
+        carry = block[count * frame_size:]
+    energy = np.concatenate(energies) if energies else np.zeros(0, dtype=np.float32)
+    return 10 * np.log10(energy + 1e-12), total
+
+def voiced_bounds(energy_db: np.ndarray, sample_count: int, sample_rate: int = AUDIO_SAMPLE_RATE) -> Tuple[int, int]:
+    """Sample range from the first to the last voiced frame (plus padding), given the frame energies"""
+    if len(energy_db) == 0:
+        return 0, sample_count
+    frame_size = sample_rate * AUDIO_VAD_FRAME_MS // 1000
+    # Voiced = loud in absolute terms and within the dynamic range of the loudest frame
+    threshold = max(AUDIO_VAD_THRESHOLD_DB, float(energy_db.max()) - AUDIO_VAD_DYNAMIC_RANGE_DB)
+    voiced = np.flatnonzero(energy_db > threshold)
+    if len(voiced) == 0:
+        return 0, sample_count
+    padding = int(AUDIO_VAD_PADDING * sample_rate)
+    start = max(0, int(voiced[0]) * frame_size - padding)
+    end = min(sample_count, (int(voiced[-1]) + 1) * frame_size + padding)
+    return start, end
+
+def read_pcm_blocks(file, start: int, end: int, block_samples: int = AUDIO_SAMPLE_RATE * 10):
+    """int16 samples [start, end) of a raw PCM file, block_samples at a time"""
+    file.seek(start * 2)
+    remaining = end - start
+    while remaining > 0:
+        block = np.frombuffer(file.read(min(remaining, block_samples) * 2), dtype=np.int16)
+        if len(block) == 0:
+            break
+        remaining -= len(block)
+        yield block
+
+def encode_audio(blocks, sample_rate: int = AUDIO_SAMPLE_RATE, codec: str = AUDIO_ENCODE_CODEC) -> bytes:
+    """Encode mono int16 sample blocks into a compact container"""
+    container_format, codec_name = AUDIO_ENCODINGS[codec]
+    buffer = io.BytesIO()
+    with av.open(buffer, "w", format=container_format) as container:
+        stream = container.add_stream(codec_name, rate=sample_rate)
+        stream.layout = "mono"
+        if codec == "opus":
+            stream.bit_rate = AUDIO_OPUS_BITRATE
+        for block in blocks:
+            frame = av.AudioFrame.from_ndarray(block.reshape(1, -1), format="s16", layout="mono")
+            frame.sample_rate = sample_rate
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return buffer.getvalue()
+
+def normalize_audio(source) -> Optional[Tuple[bytes, Dict]]:
+    """
+    Decode, downmix, resample, trim silence and re-encode a recording (path or binary file object).
+    Returns (audio bytes, stats); the bytes are only meant to replace the original when
+    stats["applied"] is true. Returns None when the input cannot be decoded.
+    """
+    started = time.perf_counter()
+    if isinstance(source, str):
+        original_bytes = os.path.getsize(source)
+    else:
+        source.seek(0, os.SEEK_END)
+        original_bytes = source.tell()
+        source.seek(0)
+    # Decoded samples go to a scratch file rather than memory, so a long recording costs disk, not RSS:
+    # the first pass only keeps one energy value per VAD frame, the second re-reads the voiced range
+    with tempfile.TemporaryFile() as pcm:
+        try:
+            energy_db, sample_count = frame_energies(spool_blocks(iter_mono_blocks(source), pcm))
+        except (av.FFmpegError, IndexError, ValueError) as e:
+            print(f"Audio preprocessing skipped, could not decode: {e}")
+            return None
+        finally:
+            if not isinstance(source, str):
+                source.seek(0)
+        if sample_count == 0:
+            return None
+
+        start, end = voiced_bounds(energy_db, sample_count)
+        audio_bytes = encode_audio(read_pcm_blocks(pcm, start, end))
+    original_seconds = sample_count / AUDIO_SAMPLE_RATE
+    trimmed_seconds = (sample_count - (end - start)) / AUDIO_SAMPLE_RATE
+    # Only worth uploading if it is smaller or bills less audio
+    applied = len(audio_bytes) < original_bytes or trimmed_seconds > 0
+    stats = {
+        "applied": applied,
+        "original_bytes": original_bytes,
+        "uploaded_bytes": len(audio_bytes) if applied else original_bytes,
+        "bytes_saved": original_bytes - len(audio_bytes) if applied else 0,
+        "original_seconds": round(original_seconds, 3),
+        "trimmed_seconds": round(trimmed_seconds, 3) if applied else 0.0,
+        "preprocess_ms": round((time.perf_counter() - started) * 1000, 1),
     }
+    return audio_bytes, stats
+
+# =====================================================================================
+# FAST-PATH EXTRACTORS
+# =====================================================================================
+
+# Rule-based extractors answer structured fields locally; anything below the confidence bar goes
+# to the CrewAI extractor instead. Extractors take English text and return (value, confidence).
+FAST_PATH_EXTRACTORS: Dict[str, Callable[[str], Optional[Tuple[str, float]]]] = {}
+
+# Field ids with a known type; other fields are typed by keywords in their name. Only quantities are
+# numbers: identifiers such as "License Number" ("ABC 1234") would be cut down to their digits
+FIELD_TYPES = {"inspection_date": "date", "property_address": "address"}
+FIELD_TYPE_KEYWORDS = [
+    ("email", "email"), ("e-mail", "email"), ("phone", "phone"), ("mobile", "phone"), ("telephone", "phone"),
+    ("date", "date"), ("address", "address"), ("number of", "number"), ("count", "number"),
+    ("bedrooms", "number"), ("bathrooms", "number"), ("year built", "number"), ("square feet", "number"),
+    ("sq ft", "number"),
+]
+
+def fast_path_extractor(field_type: str):
+    """Register a rule-based extractor for a field type"""
+    def register(func):
+        FAST_PATH_EXTRACTORS[field_type] = func
+        return func
+    return register
+
+def field_type_for(field_name: str, field_id: Optional[str] = None) -> Optional[str]:
+    if field_id in FIELD_TYPES:
+        return FIELD_TYPES[field_id]
+    name = field_name.lower()
+    for keyword, field_type in FIELD_TYPE_KEYWORDS:
+        if re.search(rf"\b{re.escape(keyword)}\b", name):
+            return field_type
+    return None
+
+def fast_path_extract(field_name: str, text: str, field_id: Optional[str] = None) -> Optional[str]:
+    """Value from the field type's rule-based extractor, or None when the LLM should decide"""
+    extractor = FAST_PATH_EXTRACTORS.get(field_type_for(field_name, field_id))
+    if extractor is None:
+        return None
+    match = extractor(text)
+    if match is None or match[1] < FAST_PATH_MIN_CONFIDENCE:
+        return None
+    return match[0]
+
+def single_match(values: List[Tuple[str, float]]) -> Optional[Tuple[str, float]]:
+    """The one distinct value found, or None when the text is empty or ambiguous"""
+    distinct = {value for value, _ in values}
+    if len(distinct) != 1:
+        return None
+    return max(values, key=lambda item: item[1])
+
+MONTHS = {name: index for index, name in enumerate(
+    ["january", "february", "march", "april", "may", "june", "july", "august", "september", "october",
+     "november", "december"], start=1)}
+MONTHS.update({name[:3]: index for name, index in list(MONTHS.items())})
+MONTHS["sept"] = 9
+UNITS = {word: value for value, word in enumerate(
+    ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "eleven", "twelve",
+     "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"])}
+TENS = {word: value * 10 for value, word in enumerate(
+    ["twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"], start=2)}
+ORDINAL_UNITS = {word: value for value, word in enumerate(
+    ["first", "second", "third", "fourth", "fifth", "sixth", "seventh", "eighth", "ninth", "tenth", "eleventh",
+     "twelfth", "thirteenth", "fourteenth", "fifteenth", "sixteenth", "seventeenth", "eighteenth",
+     "nineteenth"], start=1)}
+ORDINAL_TENS = {"twentieth": 20, "thirtieth": 30}
+SCALES = {"hundred": 100, "thousand": 1000, "million": 1000000}
+# Words that turn today/tomorrow/yesterday into an anchor for another date ("two weeks from today")
+RELATIVE_DATE_WORDS = {"day", "days", "week", "weeks", "weekend", "fortnight", "month", "months", "year", "years",
+                       "ago", "from", "after", "before", "next", "last", "past", "since", "until", "monday",
+                       "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"}
+DIGIT_WORDS = {**{word: str(value) for word, value in UNITS.items() if value < 10}, "oh": "0"}
+
+def word_tokens(text: str) -> List[str]:
+    return re.findall(r"[a-z]+|\d+(?:\.\d+)?(?:st|nd|rd|th)?", text.lower().replace(",", ""))
+
+def parse_day(tokens: List[str], i: int) -> Tuple[Optional[int], int]:
+    """Day of month at tokens[i] ("5", "5th", "fifth", "twenty first"); returns (day, tokens used)"""
+    if i < 0 or i >= len(tokens):
+        return None, 0
+    token = tokens[i]
+    digits = re.fullmatch(r"(\d{1,2})(?:st|nd|rd|th)?", token)
+    if digits:
+        return int(digits.group(1)), 1
+    if token in ORDINAL_UNITS:
+        return ORDINAL_UNITS[token], 1
+    if token in ORDINAL_TENS:
+        return ORDINAL_TENS[token], 1
+    if token in TENS and i + 1 < len(tokens) and tokens[i + 1] in ORDINAL_UNITS and ORDINAL_UNITS[tokens[i + 1]] < 10:
+        return TENS[token] + ORDINAL_UNITS[tokens[i + 1]], 2
+    return None, 0
+
+def parse_year(tokens: List[str], i: int) -> Tuple[Optional[int], int]:
+    """Year at tokens[i] ("2026", "twenty twenty six", "two thousand and twenty six")"""
+    if i < len(tokens) and tokens[i] == "of":
+        year, used = parse_year(tokens, i + 1)
+        return year, used + 1 if year else 0
+    if i >= len(tokens):
+        return None, 0
+    if re.fullmatch(r"\d{4}", tokens[i]):
+        return int(tokens[i]), 1
+    if tokens[i:i + 2] == ["two", "thousand"]:
+        used = 2
+        if i + used < len(tokens) and tokens[i + used] == "and":
+            used += 1
+        rest, rest_used = parse_small_number(tokens, i + used)
+        return 2000 + (rest or 0), used + rest_used
+    century, used = parse_small_number(tokens, i)
+    if century in (19, 20) and used:
+        rest, rest_used = parse_small_number(tokens, i + used)
+        if rest is not None and rest_used:
+            return century * 100 + rest, used + rest_used
+    return None, 0
+
+def parse_small_number(tokens: List[str], i: int) -> Tuple[Optional[int], int]:
+    """Number below 100 spelled as one or two words ("six", "twenty six")"""
+    if i >= len(tokens):
+        return None, 0
+    if tokens[i] in UNITS:
+        return UNITS[tokens[i]], 1
+    if tokens[i] in TENS:
+        if i + 1 < len(tokens) and tokens[i + 1] in UNITS and 0 < UNITS[tokens[i + 1]] < 10:
+            return TENS[tokens[i]] + UNITS[tokens[i + 1]], 2
+        return TENS[tokens[i]], 1
+    return None, 0
+
+def build_date(year: Optional[int], month: int, day: int) -> Optional[datetime]:
+    try:
+        return datetime(year or datetime.now().year, month, day)
+    except ValueError:
+        return None
+
+@fast_path_extractor("date")
+def extract_date(text: str) -> Optional[Tuple[str, float]]:
+    """ISO dates, US numeric dates, "March 5th, 2026" / "the fifth of March" and today/tomorrow/yesterday"""
+    found = []
+    for match in re.finditer(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b", text):
+        date = build_date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        if date:
+            found.append((date, 1.0))
+    for match in re.finditer(r"\b(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})\b", text):
+        year = int(match.group(3))
+        date = build_date(year + 2000 if year < 100 else year, int(match.group(1)), int(match.group(2)))
+        if date:
+            found.append((date, 0.95))
+
+    tokens = word_tokens(text)
+    for i, token in enumerate(tokens):
+        if token not in MONTHS or (token == "may" and not (parse_day(tokens, i + 1)[0] or parse_day(tokens, i - 1)[0])):
+            continue
+        month = MONTHS[token]
+        # "March fifth 2026"
+        day, used = parse_day(tokens, i + 1)
+        year_at = i + 1 + used
+        if day is None:
+            # "fifth of March 2026" / "5 March 2026"
+            before = i - 2 if i >= 2 and tokens[i - 1] == "of" else i - 1
+            for start in (before - 1, before):
+                day, used = parse_day(tokens, start)
+                if day is not None and start + used == before + 1:
+                    break
+                day = None
+            year_at = i + 1
+        if day is None:
+            continue
+        year, year_used = parse_year(tokens, year_at)
+        date = build_date(year, month, day)
+        if date:
+            found.append((date, 0.95 if year_used else 0.8))
+
+    today = datetime.now()
+    if not RELATIVE_DATE_WORDS.intersection(tokens):
+        for word, offset in (("today", 0), ("tomorrow", 1), ("yesterday", -1)):
+            if word in tokens:
+                found.append((today + timedelta(days=offset), 0.95))
+    return single_match([(date.strftime("%Y-%m-%d"), confidence) for date, confidence in found])
+
+def parse_number_words(tokens: List[str]) -> Optional[int]:
+    """Integer from spelled-out number words ("three hundred and twenty five"), or None when the words
+    don't form one number ("two three"); years read in pairs ("nineteen ninety eight") are recognised too"""
+    year, used = parse_year(tokens, 0)
+    if year and used == len(tokens):
+        return year
+    total, current = 0, 0
+    previous = None
+    for token in tokens:
+        if token in UNITS:
+            # A unit only follows a round tens word ("twenty one") or starts a group
+            if previous in UNITS or (previous in TENS and not 0 < UNITS[token] < 10):
+                return None
+            current += UNITS[token]
+        elif token in TENS:
+            if current % 100:
+                return None
+            current += TENS[token]
+        elif token == "hundred":
+            if current % 100 != current or previous == "hundred":
+                return None
+            current = max(current, 1) * 100
+        elif token in SCALES:
+            if previous in SCALES and previous != "hundred":
+                return None
+            total += max(current, 1) * SCALES[token]
+            current = 0
+        elif token != "and":
+            return None
+        if token != "and":
+            previous = token
+    return total + current
+
+@fast_path_extractor("number")
+def extract_number(text: str) -> Optional[Tuple[str, float]]:
+    """A single number, written with digits ("1,250", "2.5") or spelled out ("three hundred"). Spelled-out
+    numbers only clear the bar when they are the whole answer: "two and a half baths" is left to the LLM"""
+    found = [(match.replace(",", ""), 1.0)
+             for match in re.findall(r"(?<![\w.])\d{1,3}(?:,\d{3})+(?:\.\d+)?(?![\w])|(?<![\w.,])\d+(?:\.\d+)?(?!\w|,\S)",
+                                     text)]
+    tokens = word_tokens(text)
+    run = []
+    for token in tokens + [""]:
+        if token in UNITS or token in TENS or token in SCALES or (token == "and" and run):
+            run.append(token)
+            continue
+        while run and run[-1] == "and":
+            run.pop()
+        if run:
+            value = parse_number_words(run)
+            if value is not None:
+                found.append((str(value), 0.9 if run == tokens else 0.8))
+        run = []
+    return single_match(found)
+
+@fast_path_extractor("phone")
+def extract_phone(text: str) -> Optional[Tuple[str, float]]:
+    """North American phone numbers, written with digits or read out digit by digit"""
+    # Spoken digits ("five five five one two ...") become digits first
+    spoken = re.sub(r"\b(" + "|".join(DIGIT_WORDS) + r")\b", lambda m: DIGIT_WORDS[m.group(1)], text.lower())
+    found = []
+    for match in re.findall(r"\+?\d[\d\s().-]{8,}\d", spoken):
+        digits = re.sub(r"\D", "", match)
+        if len(digits) == 11 and digits[0] == "1":
+            digits = digits[1:]
+        if len(digits) == 10:
+            confidence = 1.0 if match in text else 0.9
+            found.append((f"({digits[:3]}) {digits[3:6]}-{digits[6:]}", confidence))
+    return single_match(found)
+
+@fast_path_extractor("email")
+def extract_email(text: str) -> Optional[Tuple[str, float]]:
+    """Email addresses, written out or dictated ("john dot smith at example dot com")"""
+    pattern = r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"
+    found = [(match.lower().rstrip("."), 1.0) for match in re.findall(pattern, text)]
+    if not found:
+        spoken = re.sub(r"\s+(?:at)\s+", "@", text.lower())
+        spoken = re.sub(r"\s+(?:dot)\s+", ".", spoken)
+        spoken = re.sub(r"\s+(?:underscore)\s+", "_", spoken)
+        spoken = re.sub(r"\s+(?:dash|hyphen)\s+", "-", spoken)
+        found = [(match.rstrip("."), 0.9) for match in re.findall(pattern, spoken)]
+    return single_match(found)
+
+STREET_SUFFIXES = (r"Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln|Court|Ct|Way|Place|Pl|Terrace|"
+                   r"Circle|Cir|Parkway|Pkwy|Highway|Hwy|Trail|Loop")
+ADDRESS_PATTERN = re.compile(
+    rf"\b\d+[A-Za-z]?(?:\s+[A-Z0-9][\w'.-]*){{1,4}}?\s+(?:{STREET_SUFFIXES})\b\.?"
+    rf"(?:\s+(?:NW|NE|SW|SE|N|S|E|W)\b\.?)?"
+    rf"(?:,?\s+(?:Apt|Apartment|Unit|Suite|#)\.?\s*\w+)?"
+    rf"(?P<locality>,?\s+[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*,?\s+[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)?,?\s+\d{{5}}(?:-\d{{4}})?)?"
+)
+
+@fast_path_extractor("address")
+def extract_address(text: str) -> Optional[Tuple[str, float]]:
+    """Street addresses ("123 Main Street"), with unit, city, state and ZIP when given. A street with more
+    words after it but no recognisable locality ("... in Springfield, Illinois") is left to the LLM"""
+    found = []
+    for match in ADDRESS_PATTERN.finditer(text):
+        if match.group("locality"):
+            confidence = 0.95
+        else:
+            confidence = 0.8 if re.search(r"\w", text[match.end():]) else 0.9
+        found.append((match.group(0).strip().rstrip(".,"), confidence))
+    return single_match(found)
+
+# =====================================================================================
+# HELPER FUNCTIONS
+# =====================================================================================
+
+async def iter_file_chunks(file_path: str, chunk_size: int = UPLOAD_CHUNK_SIZE):
+    """Yield a file's bytes in fixed-size chunks without blocking the event loop"""
+    async with aiofiles.open(file_path, 'rb') as f:
+        while True:
+            chunk = await f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+async def iter_upload_chunks(audio_file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE,
+                             copy_to: Optional[str] = None):
+    """Stream an UploadFile's spool in fixed-size chunks, optionally copying them to disk as they pass"""
+    await audio_file.seek(0)
+    copy = await aiofiles.open(copy_to, 'wb') if copy_to else None
+    try:
+        while True:
+            chunk = await audio_file.read(chunk_size)
+            if not chunk:
+                break
+            if copy:
+                await copy.write(chunk)
+            yield chunk
+    finally:
+        if copy:
+            await copy.close()
+
+async def save_upload(audio_file: UploadFile, file_path: str):
+    """Copy an UploadFile to disk chunk by chunk"""
+    with stage_timer("file_save"):
+        async for _ in iter_upload_chunks(audio_file, copy_to=file_path):
+            pass
+
+async def poll_assemblyai_for_result(transcript_id: str, headers: dict):
+    """Poll AssemblyAI for transcription result"""
+    return await assemblyai_client.poll(transcript_id, headers)
+
+async def hash_chunks(chunks) -> str:
+    """SHA-256 of an async byte stream"""
+    digest = hashlib.sha256()
+    with stage_timer("audio_hash"):
+        async for chunk in chunks:
+            digest.update(chunk)
+    return digest.hexdigest()
+
+async def cached_transcription(api_key: str, audio_digest: str, open_chunks, language_preference: str,
+                               speaker_labels: bool, source=None, upload_url: Optional[str] = None,
+                               on_upload: Optional[Callable[[str], None]] = None):
+    """
+    Return a cached transcript for identical audio and options, or transcribe and remember it.
+    On a miss the recording (source: path or file object) is normalized before upload; the
+    result's "preprocessing" entry reports what that saved, and is None for cache hits.
+    An earlier `upload_url` for the same audio is reused instead of uploading it again; a new
+    upload is reported to `on_upload` as soon as it finishes.
+    """
+    cache_key = TranscriptCache.key(audio_digest, language_preference, speaker_labels)
+    cached = await transcript_cache.get(cache_key)
+    if cached is not None:
+        print(f"Transcript cache hit for {audio_digest[:12]}")
+        return {**cached, "preprocessing": None}
+    if upload_url:
+        try:
+            result = await assemblyai_client.transcribe_uploaded(api_key, upload_url, language_preference,
+                                                                 speaker_labels)
+            await transcript_cache.put(cache_key, result)
+            return {**result, "preprocessing": None}
+        except HTTPException as e:
+            if isinstance(e, DeadlineExceeded) or e.status_code < 500 or e.status_code == 503:
+                raise
+            # The upload may have expired upstream; fall through and upload the bytes again
+            print(f"Reusing upload {upload_url} failed ({e.detail}), uploading again")
+            UPSTREAM_RETRIES.labels("assemblyai", "assemblyai_upload").inc()
+    preprocessing = None
+    if AUDIO_NORMALIZE and source is not None:
+        with stage_timer("audio_preprocess"):
+            normalized = await run_in_threadpool(normalize_audio, source)
+        if normalized is not None:
+            audio_bytes, preprocessing = normalized
+            print(f"Audio preprocessing: {preprocessing}")
+            if preprocessing["applied"]:
+                # Sent as bytes rather than streamed, so a failed upload can be retried
+                open_chunks = lambda: audio_bytes
+    result = await assemblyai_client.transcribe(api_key, open_chunks(), language_preference, speaker_labels,
+                                                on_upload=on_upload)
+    await transcript_cache.put(cache_key, result)
+    return {**result, "preprocessing": preprocessing}
+
+async def transcribe_audio(api_key: str, audio_file_path: str, language_preference: str = "auto", 
+                           speaker_labels: bool = False, upload_url: Optional[str] = None,
+                           on_upload: Optional[Callable[[str], None]] = None):
+    """Transcribe audio using AssemblyAI"""
+    audio_digest = await hash_chunks(iter_file_chunks(audio_file_path))
+    return await cached_transcription(
+        api_key, audio_digest, lambda: iter_file_chunks(audio_file_path), language_preference, speaker_labels,
+        source=audio_file_path, upload_url=upload_url, on_upload=on_upload
+    )
+
+async def transcribe_upload(api_key: str, audio_file: UploadFile, language_preference: str = "auto",
+                            speaker_labels: bool = False, copy_to: Optional[str] = None,
+                            on_upload: Optional[Callable[[str], None]] = None):
+    """Transcribe an uploaded file by piping it straight to AssemblyAI, never holding it all in memory"""
+    audio_digest = await hash_chunks(iter_upload_chunks(audio_file, copy_to=copy_to))
+    return await cached_transcription(
+        api_key, audio_digest, lambda: iter_upload_chunks(audio_file), language_preference, speaker_labels,
+        source=audio_file.file, on_upload=on_upload
+    )
+
+async def transcribe_qna_audio(audio_file: UploadFile, language: str):
+    """Transcribe a Q&A answer, keep the recording for retries and convert the text to English"""
+    # The recording is copied to disk chunk by chunk while it is read
+    file_id = str(uuid.uuid4())
+    file_path = audio_store.path_for(file_id)
+    print(f"Received Q&A audio file: {audio_file.size} bytes")
     
-    if speaker_labels:
-        json_data['speaker_labels'] = True
-        json_data['disfluencies'] = True
+    # Transcribe
+    print(f"Transcribing Q&A audio with language: {language}")
+    # Captured as soon as the upload lands, so a retry after a failed submit or poll skips the upload
+    uploads = []
+    try:
+        result = await transcribe_upload(ASSEMBLYAI_API_KEY, audio_file, language, speaker_labels=True,
+                                         copy_to=file_path, on_upload=uploads.append)
+    except HTTPException as e:
+        # Keep the recording so the client can retry by id without sending it again
+        await audio_store.add(file_id, upload_url=uploads[-1] if uploads else None)
+        raise HTTPException(status_code=e.status_code, detail=e.detail,
+                            headers={**(e.headers or {}), "X-Audio-File-Id": file_id})
+    except BaseException:
+        # A disconnect or an unexpected error never hands the id to the client, so nothing could retry it
+        AudioStore._delete([file_path])
+        raise
+    await audio_store.add(file_id, upload_url=uploads[-1] if uploads else None)
+    print(f"Q&A Transcription result: {result['text'][:100]}...")
+    return await qna_transcription_payload(file_id, result)
+
+async def qna_transcription_payload(file_id: str, result: Dict) -> Dict:
+    """Q&A transcription response for a retained recording, with the text converted to English"""
+    # Convert to English if needed
+    english_text = result["text"]
+    if result["language_code"] and not is_english(result["language_code"]):
+        print(f"Converting from {result['language_code']} to English")
+        english_text = await run_in_threadpool(convert_to_english, result["text"], result["language_code"])
     
-    if language_preference == 'auto':
-        json_data['language_detection'] = True
-    else:
-        json_data['language_code'] = language_preference
+    return {
+        "transcription": result["text"],
+        "language_code": result["language_code"],
+        "confidence": result["confidence"],
+        "english_text": english_text,
+        "audio_file_id": file_id,
+        "audio_preprocessing": result["preprocessing"]
+    }
 
-    try:
-        transcript_response = requests.post('https://api.assemblyai.com/v2/transcript', 
-                                           json=json_data, headers=headers)
-        transcript_response.raise_for_status()
-        transcript_id = transcript_response.json().get('id')
-        if not transcript_id:
-            raise HTTPException(status_code=500, detail="AssemblyAI did not return a transcript ID")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error requesting transcription: {str(e)}")
+def is_english(language_code: Optional[str]) -> bool:
+    """True for 'en' and regional variants such as 'en_us'"""
+    return bool(language_code) and language_code.lower().replace('-', '_').split('_')[0] == 'en'
 
-    polling_result = poll_assemblyai_for_result(transcript_id, headers)
-    
-    if polling_result and polling_result['status'] == 'completed':
-        text = polling_result.get('text', '').strip()
-        if not text:
-            raise HTTPException(status_code=400, 
-                              detail="No speech detected in the audio. Please ensure you speak clearly.")
-        return {
-            "text": text,
-            "language_code": polling_result.get('language_code', 'en'),
-            "confidence": polling_result.get('confidence', 0.0)
-        }
-    elif polling_result:
-        error_msg = polling_result.get('error', 'Unknown transcription error')
-        raise HTTPException(status_code=500, detail=f"Transcription failed: {error_msg}")
-    else:
-        raise HTTPException(status_code=500, detail="Failed to get transcription result")
+def translate_to_english(text: str, language_code: str) -> str:
+    """Translate with the CrewAI translator, skipping English input and reusing earlier results"""
+    if is_english(language_code):
+        return text
+    return memoize_llm_stage(
+        "translation", language_code, text,
+        lambda: str(crew_registry.kickoff(
+            "translation", {"text": text, "language_code": language_code}, temperature=0.1
+        )).strip()
+    )
 
 def convert_to_english(text: str, language_code: str):
     """Convert text to English using CrewAI translator agent"""
     try:
-        llm = ChatOpenAI(api_key=OPENAI_API_KEY, model_name="gpt-4o", temperature=0.1)
-        translator_agent = Agent(
-            role='Expert Language Translator',
-            goal='Translate text to English, but first verify if it is already English.',
-            backstory='An expert linguist who trusts text content over potentially incorrect language codes.',
-            llm=llm,
-            verbose=False,
-            allow_delegation=False
-        )
-        translation_task = Task(
-            description=f"Text: '{text}'. Detected language: '{language_code}'. If the text content is English, return it as is. Otherwise, translate to English.",
-            agent=translator_agent,
-            expected_output="The text in English."
-        )
-        translation_crew = Crew(
-            agents=[translator_agent],
-            tasks=[translation_task],
-            process=Process.sequential
-        )
-        english_text = translation_crew.kickoff()
-        return str(english_text).strip()
+        return translate_to_english(text, language_code)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"English conversion error: {str(e)}")
 
-def extract_field_info_with_crewai(field_name: str, transcript: str, language_code: str):
-    """Extract field information using CrewAI"""
+def extract_field_info_with_crewai(field_name: str, transcript: str, language_code: str,
+                                   field_id: Optional[str] = None):
+    """Extract field information, answering structured fields with rules and the rest with CrewAI"""
     try:
-        llm = ChatOpenAI(api_key=OPENAI_API_KEY, model_name="gpt-4o", temperature=0.1)
-        
         # Translation
-        translator_agent = Agent(
-            role='Expert Language Translator',
-            goal=f'Translate the text to English. If it is already English ({language_code}), return it unchanged.',
-            backstory='A skilled translator ensuring accuracy.',
-            verbose=False, llm=llm, allow_delegation=False
-        )
-        translation_task = Task(
-            description=f"Translate to English: '{transcript}'. Source language code: '{language_code}'.",
-            expected_output="The English translation.",
-            agent=translator_agent
-        )
-        translation_crew = Crew(
-            agents=[translator_agent],
-            tasks=[translation_task],
-            process=Process.sequential
-        )
-        english_transcript = translation_crew.kickoff()
+        english_transcript = translate_to_english(transcript, language_code)
+        
+        # Rule-based fast path
+        if FAST_PATH_EXTRACTION:
+            fast_value = fast_path_extract(field_name, english_transcript, field_id)
+            if fast_value is not None:
+                return {
+                    "field_value": fast_value,
+                    "translated_text": english_transcript.strip(),
+                    "extraction_path": "rule"
+                }
         
         # Extraction
-        extractor_agent = Agent(
-            role='Information Extractor Agent',
-            goal=f"Extract the specific information for the form field: '{field_name}'. Output ONLY the value.",
-            backstory=f"An AI expert at parsing English text to fill forms accurately.",
-            verbose=False, llm=llm, allow_delegation=False
-        )
-        extraction_task = Task(
-            description=f"From the text: '{english_transcript}', extract the value for the field '{field_name}'.",
-            expected_output=f"The precise value for '{field_name}'.",
-            agent=extractor_agent
+        extracted_value = memoize_llm_stage(
+            "extraction", "en", english_transcript,
+            lambda: str(crew_registry.kickoff(
+                "extraction", {"text": english_transcript, "field_name": field_name}, temperature=0.1
+            )).strip(),
+            field_name
         )
-        extraction_crew = Crew(
-            agents=[extractor_agent],
-            tasks=[extraction_task],
-            process=Process.sequential
+        
+        return {
+            "field_value": extracted_value,
+            "translated_text": english_transcript.strip(),
+            "extraction_path": "llm"
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"CrewAI Error: {str(e)}")
+
+def parse_json_object(raw: str) -> dict:
+    """Parse the JSON object in an LLM reply, tolerating code fences and surrounding prose"""
+    start, end = raw.find('{'), raw.rfind('}')
+    if start == -1 or end <= start:
+        raise ValueError(f"No JSON object in model output: {raw[:200]}")
+    return json.loads(raw[start:end + 1])
+
+def extract_all_fields_with_crewai(fields: List[FormFieldSpec], transcript: str, language_code: str):
+    """Translate once and extract every form field in a single structured (JSON) call"""
+    try:
+        english_transcript = convert_to_english(transcript, language_code)
+        
+        field_list = "\n".join(f'- "{field.id}": {field.name}' for field in fields)
+        extracted = memoize_llm_stage(
+            "multi_extraction", "en", english_transcript,
+            lambda: parse_json_object(str(crew_registry.kickoff(
+                "multi_extraction", {"text": english_transcript, "field_list": field_list}, temperature=0.1
+            ))),
+            field_list
         )
-        extracted_value = extraction_crew.kickoff()
+        
+        results = {}
+        for field in fields:
+            entry = extracted.get(field.id) or {}
+            if not isinstance(entry, dict):
+                entry = {"value": entry, "confidence": 0.5}
+            try:
+                confidence = max(0.0, min(1.0, float(entry.get("confidence", 0.0))))
+            except (TypeError, ValueError):
+                confidence = 0.0
+            results[field.id] = {
+                "value": str(entry.get("value") or "").strip(),
+                "confidence": confidence
+            }
         
         return {
-            "field_value": str(extracted_value).strip(),
-            "translated_text": str(english_transcript).strip()
+            "fields": results,
+            "translated_text": english_transcript
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"CrewAI Error: {str(e)}")
 
@@ -262,107 +2487,579 @@ def process_answer_with_crewai(question: str, answer: str, language_code: str):
     if not answer:
         return {"summary": "No answer provided.", "relevancy_score": "N/A"}
     
-    try:
-        llm = ChatOpenAI(api_key=OPENAI_API_KEY, model_name="gpt-4o", temperature=0.2)
-        
-        translator_agent = Agent(
-            role='Expert Language Translator',
-            goal='Translate text to English, but first verify if it is already English.',
-            backstory='An expert linguist who trusts text content over potentially incorrect language codes.',
-            llm=llm
-        )
-        analyzer_agent = Agent(
-            role='Answer Relevance Analyzer',
-            goal='Analyze ENGLISH text for relevance to the question.',
-            backstory='Expert in linguistic analysis.',
-            llm=llm
-        )
-        relevancy_agent = Agent(
-            role='Answer Quality Scorer',
-            goal='Provide numerical scores (1-10) for answer quality.',
-            backstory='Professional evaluator.',
-            llm=llm
-        )
-        summarizer_agent = Agent(
-            role='Concise Summarizer',
-            goal='Summarize the key points of the ENGLISH answer.',
-            backstory='Professional editor.',
-            llm=llm
-        )
-        
-        translation_task = Task(
-            description=f"Text: '{answer}'. Detected language: '{language_code}'. If the text content is English, return it as is. Otherwise, translate to English.",
-            agent=translator_agent,
-            expected_output="The text in English."
-        )
-        analysis_task = Task(
-            description=f"Analyze this ENGLISH answer for the question: '{question}'.",
-            agent=analyzer_agent,
-            context=[translation_task],
-            expected_output="Key points and a conclusion on relevance."
-        )
-        relevancy_task = Task(
-            description="""Based on the analysis, score the answer's relevance, content match, completeness, and specificity from 1-10. 
-            
-            Format your response EXACTLY as bullet points like this:
-            • Relevance: [score] - [brief one-line explanation]
-            • Content Match: [score] - [brief one-line explanation]
-            • Completeness: [score] - [brief one-line explanation]
-            • Specificity: [score] - [brief one-line explanation]
-            
-            Example format:
-            • Relevance: 10 - The answer directly addresses the key features of the property.
-            • Content Match: 10 - The answer matches the expected content by providing details on bedrooms, washrooms, and upgrades.
-            • Completeness: 10 - The answer covers all necessary aspects such as size, layout, and upgrades.
-            • Specificity: 10 - The answer is specific, providing exact numbers and detailed information.
-            """,
-            agent=relevancy_agent,
-            context=[analysis_task],
-            expected_output="A bullet-point list with scores (1-10) for Relevance, Content Match, Completeness, and Specificity, each with a one-line explanation."
-        )
-        summary_task = Task(
-            description="Create a concise, two-sentence summary of the user's response.",
-            agent=summarizer_agent,
-            context=[analysis_task],
-            expected_output="A polished two-sentence summary."
-        )
-        
-        qa_crew = Crew(
-            agents=[translator_agent, analyzer_agent, relevancy_agent, summarizer_agent],
-            tasks=[translation_task, analysis_task, relevancy_task, summary_task],
-            process=Process.sequential
+    stage_timings = {}
+    
+    def run_qna_crew():
+        # translate -> analyze -> (score, summarize): scoring and summary both only need the analysis.
+        # English answers skip the translation: callers pass "en" with english_text once it is translated
+        crew_name = "qna_english" if is_english(language_code) else "qna"
+        task_outputs, timings = crew_registry.run_graph(
+            crew_name, {"question": question, "answer": answer, "language_code": language_code}, temperature=0.2
         )
-        crew_results = qa_crew.kickoff()
-        task_outputs = crew_results.tasks_output
+        stage_timings.update(timings)
         
-        relevancy_result = task_outputs[2].raw if len(task_outputs) > 2 else "Scoring unavailable."
-        summary_result = task_outputs[3].raw if len(task_outputs) > 3 else "Summary unavailable."
+        # Scoring and summary are the last two tasks of either crew
+        relevancy_result = task_outputs[-2].raw if len(task_outputs) > 2 else "Scoring unavailable."
+        summary_result = task_outputs[-1].raw if len(task_outputs) > 2 else "Summary unavailable."
         
         return {"summary": summary_result, "relevancy_score": relevancy_result}
+    
+    try:
+        result = dict(memoize_llm_stage("qna", language_code, answer, run_qna_crew, normalize_text(question)))
+        result["stage_timings_ms"] = stage_timings
+        return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"CrewAI processing error: {str(e)}")
 
+# =====================================================================================
+# STREAMING SPEECH-TO-TEXT
+# =====================================================================================
+
+class StreamingSTTBackend(ABC):
+    """Interface for streaming speech-to-text backends used by /ws/transcribe-live.
+
+    Audio is 16-bit little-endian mono PCM. `events()` yields
+    {"type": "partial" | "final", "text": ...} until the backend has flushed
+    everything after `finish()`. `language_code` is the language the backend
+    transcribed in (detected for "auto"), or None when it could not tell.
+    """
+
+    language_code: Optional[str] = None
+
+    @abstractmethod
+    async def start(self, sample_rate: int, language: str):
+        ...
+
+    @abstractmethod
+    async def send_audio(self, chunk: bytes):
+        ...
+
+    @abstractmethod
+    async def finish(self):
+        ...
+
+    @abstractmethod
+    def events(self) -> AsyncIterator[Dict]:
+        ...
+
+    async def close(self):
+        pass
+
+class AssemblyAIStreamingBackend(StreamingSTTBackend):
+    """AssemblyAI real-time (v3 universal streaming) WebSocket API.
+
+    "en" uses the English model; the other languages it supports, and "auto", use the
+    multilingual model, which for "auto" also reports the language of each turn.
+    """
+
+    MULTILINGUAL = {"es", "fr", "de", "it", "pt"}
+
+    def __init__(self, api_key: str, url: str = ASSEMBLYAI_STREAMING_URL):
+        self.api_key = api_key
+        self.url = url
+        self._ws = None
+        self._detect = False
+        self._detected = []
+
+    async def start(self, sample_rate: int, language: str):
+        if language != "auto" and not is_english(language) and language not in self.MULTILINGUAL:
+            supported = ", ".join(sorted(self.MULTILINGUAL | {"en"}))
+            raise HTTPException(status_code=400, detail=f"Live transcription does not support '{language}' "
+                                                        f"(supported: {supported}); record without live mode instead")
+        self._detect = language == "auto"
+        self.language_code = None if self._detect else language
+        params = {"sample_rate": sample_rate, "encoding": "pcm_s16le", "format_turns": "true"}
+        if not is_english(language):
+            params["speech_model"] = "universal-streaming-multilingual"
+        if language == "auto":
+            params["language_detection"] = "true"
+        self._ws = await websockets.connect(f"{self.url}?{urlencode(params)}",
+                                            additional_headers={"Authorization": self.api_key})
+
+    async def send_audio(self, chunk: bytes):
+        await self._ws.send(chunk)
+
+    async def finish(self):
+        await self._ws.send(json.dumps({"type": "Terminate"}))
+
+    async def events(self):
+        async for message in self._ws:
+            data = json.loads(message)
+            if data.get("type") == "Turn":
+                # With format_turns the end of a turn arrives twice; only the formatted one is final
+                final = data.get("end_of_turn") and data.get("turn_is_formatted")
+                if final and self._detect and data.get("language_code"):
+                    self._detected.append(data["language_code"])
+                    # The language most turns were spoken in
+                    self.language_code = max(set(self._detected), key=self._detected.count)
+                yield {"type": "final" if final else "partial", "text": data.get("transcript", "")}
+            elif data.get("type") == "Termination":
+                return
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+
+class LocalStreamingBackend(StreamingSTTBackend):
+    """Local stand-in that reveals a scripted transcript as audio arrives (for tests and benchmarks)"""
+
+    def __init__(self, transcript: str = LOCAL_STT_TRANSCRIPT, seconds_per_word: float = 0.25):
+        self.words = transcript.split()
+        self.seconds_per_word = seconds_per_word
+        self._events: asyncio.Queue = asyncio.Queue()
+        self._bytes_per_word = 0
+        self._received = 0
+        self._revealed = 0
+
+    async def start(self, sample_rate: int, language: str):
+        self._bytes_per_word = max(1, int(sample_rate * 2 * self.seconds_per_word))
+        # The scripted transcript is English
+        self.language_code = "en" if language == "auto" else language
+
+    async def send_audio(self, chunk: bytes):
+        self._received += len(chunk)
+        revealed = min(len(self.words), self._received // self._bytes_per_word)
+        if revealed > self._revealed:
+            self._revealed = revealed
+            await self._events.put({"type": "partial", "text": " ".join(self.words[:revealed])})
+
+    async def finish(self):
+        await self._events.put({"type": "final", "text": " ".join(self.words)})
+        await self._events.put(None)
+
+    async def events(self):
+        while (event := await self._events.get()) is not None:
+            yield event
+
+def create_streaming_backend() -> StreamingSTTBackend:
+    if STREAMING_STT_BACKEND == "local":
+        return LocalStreamingBackend()
+    return AssemblyAIStreamingBackend(ASSEMBLYAI_API_KEY)
+
+async def live_transcript_result(options: Dict, transcript: str, language_code: str) -> Dict:
+    """Run the extraction / analysis step for a finished live transcript"""
+    mode = options.get("mode", "form")
+    if mode == "form":
+        extraction = await run_in_threadpool(
+            extract_field_info_with_crewai, options["field_name"], transcript, language_code, options.get("field_id")
+        )
+        return {"translated_text": extraction["translated_text"], "field_value": extraction["field_value"],
+                "extraction_path": extraction["extraction_path"]}
+    if mode == "form-multi":
+        field_specs = [FormFieldSpec(**field) for field in options["fields"]]
+        return await run_in_threadpool(extract_all_fields_with_crewai, field_specs, transcript, language_code)
+    if mode == "qna":
+        english_text = await run_in_threadpool(convert_to_english, transcript, language_code)
+        result = {"english_text": english_text}
+        if options.get("question"):
+            result.update(await run_in_threadpool(
+                process_answer_with_crewai, options["question"], english_text, "en"
+            ))
+        return result
+    raise HTTPException(status_code=400, detail=f"Unknown live transcription mode: {mode}")
+
+# =====================================================================================
+# BACKGROUND JOBS
+# =====================================================================================
+
+class Job:
+    """A queued pipeline run with stage-by-stage progress events"""
+
+    def __init__(self, kind: str, pipeline):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.pipeline = pipeline
+        self.status = "queued"
+        self.stage = "queued"
+        self.events: List[Dict] = []
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.timeout = REQUEST_DEADLINE
+        self._changed = asyncio.Event()
+        self.report("queued")
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def report(self, stage: str, **detail):
+        """Record a progress event and wake any listeners"""
+        self.stage = stage
+        self.events.append({"stage": stage, "status": self.status, "time": time.time(), **detail})
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_change(self, timeout: float):
+        changed = self._changed
+        await asyncio.wait_for(changed.wait(), timeout)
+
+    def snapshot(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "events": self.events,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+class JobManager:
+    """Bounded queue of background jobs drained by a fixed pool of worker tasks"""
+
+    def __init__(self, workers: int = JOB_WORKERS, queue_size: int = JOB_QUEUE_SIZE, result_ttl: float = JOB_RESULT_TTL):
+        self.worker_count = workers
+        self.queue_size = queue_size
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def start(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, kind: str, pipeline) -> Job:
+        """Queue `pipeline(job)`; raises 503 when the queue is full so clients back off"""
+        self._prune()
+        if self._queue is None:
+            self.start()
+        job = Job(kind, pipeline)
+        deadline = current_deadline.get()
+        job.timeout = deadline.seconds if deadline is not None else REQUEST_DEADLINE
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=503, detail="Job queue is full, please retry shortly",
+                                headers={"Retry-After": "5"})
+        self.jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Job:
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+    def _prune(self):
+        cutoff = time.time() - self.result_ttl
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished and job.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            # The deadline starts when the job does, so time spent queued does not count
+            token = current_deadline.set(Deadline(job.timeout))
+            try:
+                job.result = await job.pipeline(job)
+                job.status = "completed"
+            except HTTPException as e:
+                job.status, job.error = "failed", e.detail
+            except Exception as e:
+                print(f"Error in {job.kind} job {job.id}: {str(e)}")
+                job.status, job.error = "failed", str(e)
+            finally:
+                current_deadline.reset(token)
+                job.finished_at = time.time()
+                job.report(job.status)
+                self._queue.task_done()
+
+    def stats(self) -> Dict:
+        statuses = [job.status for job in self.jobs.values()]
+        return {
+            "workers": self.worker_count,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_size": self.queue_size,
+            **{status: statuses.count(status) for status in ("queued", "running", "completed", "failed")},
+        }
+
+job_manager = JobManager()
+
+def form_job_pipeline(file_path: str, field_name: str, language: str, field_id: Optional[str] = None):
+    async def pipeline(job: Job):
+        try:
+            job.report("transcribing")
+            result = await transcribe_audio(ASSEMBLYAI_API_KEY, file_path, language)
+            job.report("extracting", transcription=result["text"])
+            extraction = await run_in_threadpool(
+                extract_field_info_with_crewai, field_name, result["text"], result["language_code"], field_id
+            )
+            return {
+                "transcription": result["text"],
+                "language_code": result["language_code"],
+                "confidence": result["confidence"],
+                "translated_text": extraction["translated_text"],
+                "field_value": extraction["field_value"],
+                "extraction_path": extraction["extraction_path"],
+                "audio_preprocessing": result["preprocessing"]
+            }
+        finally:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+    return pipeline
+
+def form_multi_job_pipeline(file_path: str, field_specs: List[FormFieldSpec], language: str):
+    async def pipeline(job: Job):
+        try:
+            job.report("transcribing")
+            result = await transcribe_audio(ASSEMBLYAI_API_KEY, file_path, language)
+            job.report("extracting", transcription=result["text"])
+            extraction = await run_in_threadpool(
+                extract_all_fields_with_crewai, field_specs, result["text"], result["language_code"]
+            )
+            return {
+                "transcription": result["text"],
+                "language_code": result["language_code"],
+                "confidence": result["confidence"],
+                "translated_text": extraction["translated_text"],
+                "fields": extraction["fields"],
+                "audio_preprocessing": result["preprocessing"]
+            }
+        finally:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+    return pipeline
+
+def qna_job_pipeline(file_id: str, file_path: str, language: str, question: Optional[str]):
+    async def pipeline(job: Job):
+        job.report("transcribing")
+        result = await transcribe_audio(ASSEMBLYAI_API_KEY, file_path, language, speaker_labels=True,
+                                        on_upload=lambda upload_url: audio_store.remember_upload(file_id, upload_url))
+        english_text = result["text"]
+        if result["language_code"] and not is_english(result["language_code"]):
+            job.report("translating", transcription=result["text"])
+            english_text = await run_in_threadpool(convert_to_english, result["text"], result["language_code"])
+        payload = {
+            "transcription": result["text"],
+            "language_code": result["language_code"],
+            "confidence": result["confidence"],
+            "english_text": english_text,
+            "audio_file_id": file_id,
+            "audio_preprocessing": result["preprocessing"]
+        }
+        if question:
+            job.report("analyzing", transcription=result["text"])
+            payload.update(await run_in_threadpool(
+                process_answer_with_crewai, question, english_text, "en"
+            ))
+        return payload
+    return pipeline
+
+def job_accepted(job: Job) -> JSONResponse:
+    return JSONResponse(status_code=202, content={
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/jobs/{job.id}",
+        "events_url": f"/api/jobs/{job.id}/events"
+    })
+
+# =====================================================================================
+# ASSETS
+# =====================================================================================
+
+COMPRESSIBLE_TYPES = {"application/javascript", "application/json", "image/svg+xml"}
+
+class Asset:
+    """One file held in memory, with its precompressed variants keyed by content coding"""
+
+    def __init__(self, path: str, body: bytes, mtime: float):
+        self.path = path
+        self.mtime = mtime
+        self.media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        digest = hashlib.sha256(body).hexdigest()[:20]
+        self.variants = {"identity": (body, f'"{digest}"')}
+        if len(body) >= ASSET_COMPRESS_MIN_BYTES and (
+                self.media_type.startswith("text/") or self.media_type in COMPRESSIBLE_TYPES):
+            compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                compressed["br"] = brotli.compress(body, quality=11)
+            for coding, data in compressed.items():
+                if len(data) < len(body):
+                    self.variants[coding] = (data, f'"{digest}-{coding}"')
+
+    @property
+    def compressed(self) -> bool:
+        return len(self.variants) > 1
+
+def accepted_codings(header: str) -> set:
+    """Content codings an Accept-Encoding header allows (q > 0)"""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding.strip() and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+def etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match uses the weak comparison, so W/ prefixes are ignored"""
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+class AssetCache:
+    """In-memory pages and static files.
+
+    Files are read and compressed once (preloaded at startup); afterwards a
+    request is served without touching the disk unless ASSET_RELOAD is on, in
+    which case a changed mtime triggers a re-read.
+    """
+
+    def __init__(self, directories: List[str], reload: bool = ASSET_RELOAD):
+        self.directories = directories
+        self.reload = reload
+        self.assets: Dict[str, Asset] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, path: str) -> Optional[Asset]:
+        try:
+            mtime = os.path.getmtime(path)
+            with open(path, "rb") as f:
+                asset = Asset(path, f.read(), mtime)
+        except OSError:
+            with self._lock:
+                self.assets.pop(path, None)
+            return None
+        with self._lock:
+            self.assets[path] = asset
+        return asset
+
+    def preload(self):
+        for directory in self.directories:
+            for parent, _, names in os.walk(directory):
+                for name in names:
+                    self._load(os.path.join(parent, name))
+
+    def _is_stale(self, asset: Asset) -> bool:
+        try:
+            return os.path.getmtime(asset.path) != asset.mtime
+        except OSError:
+            return True
+
+    async def get(self, path: str) -> Optional[Asset]:
+        path = os.path.normpath(path)
+        asset = self.assets.get(path)
+        if asset is None or (self.reload and await run_in_threadpool(self._is_stale, asset)):
+            asset = await run_in_threadpool(self._load, path)
+        return asset
+
+    async def response(self, request: Request, path: str, cache_control: str) -> Response:
+        asset = await self.get(path)
+        if asset is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        accepted = accepted_codings(request.headers.get("accept-encoding", ""))
+        coding = next((c for c in ("br", "gzip") if c in asset.variants and c in accepted), "identity")
+        body, etag = asset.variants[coding]
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if asset.compressed:
+            headers["Vary"] = "Accept-Encoding"
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        return Response(content=body, media_type=asset.media_type, headers=headers)
+
+    def stats(self) -> Dict:
+        assets = list(self.assets.values())
+        return {
+            "assets": len(assets),
+            "bytes": sum(len(body) for asset in assets for body, _ in asset.variants.values()),
+            "brotli": brotli is not None,
+            "reload": self.reload,
+        }
+
+asset_cache = AssetCache(ASSET_DIRECTORIES)
+
+PAGE_CACHE_CONTROL = "no-cache"
+STATIC_CACHE_CONTROL = "no-cache" if ASSET_RELOAD else f"public, max-age={ASSET_MAX_AGE}"
+
 # =====================================================================================
 # ROUTES
 # =====================================================================================
 
+@app.on_event("startup")
+async def create_directories():
+    for directory in ("static/css", "static/js", "templates", AUDIO_STORE_DIR):
+        os.makedirs(directory, exist_ok=True)
+
+@app.on_event("startup")
+async def check_webhook_config():
+    """Webhook mode cannot verify callbacks without a shared secret"""
+    if PUBLIC_BASE_URL and not ASSEMBLYAI_WEBHOOK_SECRET:
+        raise RuntimeError("PUBLIC_BASE_URL enables AssemblyAI webhooks; set ASSEMBLYAI_WEBHOOK_SECRET as well")
+
+@app.on_event("startup")
+async def preload_assets():
+    """Read and precompress pages and static files before the first request"""
+    await run_in_threadpool(asset_cache.preload)
+
+@app.on_event("startup")
+async def start_ai_warmup():
+    """Load the AI stack in a worker thread; startup does not wait for it"""
+    if AI_WARMUP:
+        asyncio.get_running_loop().run_in_executor(None, warm_ai_stack)
+
+@app.on_event("startup")
+async def start_job_workers():
+    """Start the background job worker pool"""
+    job_manager.start()
+
+@app.on_event("startup")
+async def start_audio_sweeper():
+    """Index retained recordings and start evicting them by age and total size"""
+    await audio_store.start()
+
+@app.on_event("shutdown")
+async def stop_audio_sweeper():
+    await audio_store.stop()
+
+@app.on_event("shutdown")
+async def close_upstream_clients():
+    """Stop job workers and release pooled upstream connections"""
+    await job_manager.stop()
+    await assemblyai_client.aclose()
+
 @app.get("/", response_class=HTMLResponse)
-async def read_root():
+async def read_root(request: Request):
     """Serve the main page"""
-    with open("templates/index.html", "r", encoding="utf-8") as f:
-        return f.read()
+    return await asset_cache.response(request, "templates/index.html", PAGE_CACHE_CONTROL)
 
 @app.get("/form-filler", response_class=HTMLResponse)
-async def form_filler_page():
+async def form_filler_page(request: Request):
     """Serve the form filler page"""
-    with open("templates/form_filler.html", "r", encoding="utf-8") as f:
-        return f.read()
+    return await asset_cache.response(request, "templates/form_filler.html", PAGE_CACHE_CONTROL)
 
 @app.get("/qna-analysis", response_class=HTMLResponse)
-async def qna_analysis_page():
+async def qna_analysis_page(request: Request):
     """Serve the Q&A analysis page"""
-    with open("templates/qna_analysis.html", "r", encoding="utf-8") as f:
-        return f.read()
+    return await asset_cache.response(request, "templates/qna_analysis.html", PAGE_CACHE_CONTROL)
+
+@app.api_route("/static/{file_path:path}", methods=["GET", "HEAD"])
+async def static_asset(file_path: str, request: Request):
+    """Serve a file under static/ from the asset cache"""
+    path = os.path.normpath(os.path.join("static", file_path))
+    if not path.startswith("static" + os.sep):
+        raise HTTPException(status_code=404, detail="Not found")
+    return await asset_cache.response(request, path, STATIC_CACHE_CONTROL)
 
 @app.get("/api/config")
 async def get_config():
@@ -370,9 +3067,20 @@ async def get_config():
     return {
         "predefined_fields": PREDEFINED_INSPECTION_FIELDS,
         "predefined_questions": PREDEFINED_QUESTIONS,
-        "has_api_keys": bool(ASSEMBLYAI_API_KEY and OPENAI_API_KEY)
+        "has_api_keys": bool(ASSEMBLYAI_API_KEY and OPENAI_API_KEY),
+        "ai_ready": ai_stack_loaded,
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: stage and request latency histograms, upstream error and retry counters"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Cache hit/miss counters for sizing"""
+    return {"transcripts": transcript_cache.stats(), "llm": llm_cache.stats()}
+
 @app.post("/api/update-keys")
 async def update_api_keys(keys: APIKeysUpdate):
     """Update API keys"""
@@ -381,43 +3089,57 @@ async def update_api_keys(keys: APIKeysUpdate):
         ASSEMBLYAI_API_KEY = keys.assemblyai_key
     if keys.openai_key:
         OPENAI_API_KEY = keys.openai_key
+        os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
+        crew_registry.reset()
     return {"status": "success", "message": "API keys updated"}
 
-@app.post("/api/transcribe-form")
+@app.post("/api/webhooks/assemblyai")
+async def assemblyai_webhook(request: Request):
+    """Completion callback from AssemblyAI; wakes the request waiting on the transcript"""
+    if not ASSEMBLYAI_WEBHOOK_SECRET or request.headers.get(ASSEMBLYAI_WEBHOOK_HEADER) != ASSEMBLYAI_WEBHOOK_SECRET:
+        raise HTTPException(status_code=401, detail="Invalid webhook secret")
+    payload = await request.json()
+    transcript_id = payload.get("transcript_id")
+    if not transcript_id:
+        raise HTTPException(status_code=400, detail="Missing transcript_id")
+    woke = transcript_waiters.resolve(transcript_id, payload.get("status", ""))
+    return {"status": "received", "woke_waiter": woke}
+
+@app.post("/api/transcribe-form", dependencies=[Depends(form_deadline)])
 async def transcribe_for_form(
     audio_file: UploadFile = File(...),
     field_name: str = Form(...),
-    language: str = Form("auto")
+    language: str = Form("auto"),
+    field_id: Optional[str] = Form(None)
 ):
     """Transcribe audio and extract field information"""
-    # Save uploaded file
-    file_path = f"temp_audio/{uuid.uuid4()}.wav"
     try:
-        content = await audio_file.read()
-        print(f"Received audio file: {len(content)} bytes for field: {field_name}")
-        with open(file_path, "wb") as f:
-            f.write(content)
+        print(f"Received audio file: {audio_file.size} bytes for field: {field_name}")
         
-        # Transcribe
+        # Transcribe (streamed straight from the upload spool)
         print(f"Transcribing audio with language: {language}")
-        result = transcribe_audio(ASSEMBLYAI_API_KEY, file_path, language)
+        result = await transcribe_upload(ASSEMBLYAI_API_KEY, audio_file, language)
         print(f"Transcription result: {result['text'][:100]}...")
         
         # Extract field information
         print(f"Extracting field info for: {field_name}")
-        extraction = extract_field_info_with_crewai(
+        extraction = await run_in_threadpool(
+            extract_field_info_with_crewai,
             field_name,
             result["text"],
-            result["language_code"]
+            result["language_code"],
+            field_id
         )
-        print(f"Extracted value: {extraction['field_value']}")
+        print(f"Extracted value ({extraction['extraction_path']}): {extraction['field_value']}")
         
         return {
             "transcription": result["text"],
             "language_code": result["language_code"],
             "confidence": result["confidence"],
             "translated_text": extraction["translated_text"],
-            "field_value": extraction["field_value"]
+            "field_value": extraction["field_value"],
+            "extraction_path": extraction["extraction_path"],
+            "audio_preprocessing": result["preprocessing"]
         }
     except HTTPException:
         raise
@@ -426,98 +3148,466 @@ async def transcribe_for_form(
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error processing audio: {str(e)}")
-    finally:
-        # Clean up
-        if os.path.exists(file_path):
-            os.remove(file_path)
 
-@app.post("/api/transcribe-qna")
-async def transcribe_for_qna(
+@app.post("/api/transcribe-form-multi", dependencies=[Depends(form_deadline)])
+async def transcribe_for_form_multi(
     audio_file: UploadFile = File(...),
+    fields: str = Form(...),
     language: str = Form("auto")
 ):
-    """Transcribe audio for Q&A"""
-    # Save uploaded file
-    file_id = str(uuid.uuid4())
-    file_path = f"temp_audio/qna_{file_id}.wav"
+    """Fill every form field from one recording with a single translation and extraction"""
     try:
-        content = await audio_file.read()
-        print(f"Received Q&A audio file: {len(content)} bytes")
-        with open(file_path, "wb") as f:
-            f.write(content)
-        
-        # Transcribe
-        print(f"Transcribing Q&A audio with language: {language}")
-        result = transcribe_audio(ASSEMBLYAI_API_KEY, file_path, language, speaker_labels=True)
-        print(f"Q&A Transcription result: {result['text'][:100]}...")
+        field_specs = [FormFieldSpec(**field) for field in json.loads(fields)]
+    except Exception:
+        raise HTTPException(status_code=400, detail="fields must be a JSON list of {id, name} objects")
+    if not field_specs:
+        raise HTTPException(status_code=400, detail="At least one field is required")
+    
+    try:
+        print(f"Received audio file: {audio_file.size} bytes for {len(field_specs)} fields")
+        result = await transcribe_upload(ASSEMBLYAI_API_KEY, audio_file, language)
+        print(f"Transcription result: {result['text'][:100]}...")
         
-        # Convert to English if needed
-        english_text = result["text"]
-        if result["language_code"] and result["language_code"].lower() != 'en':
-            print(f"Converting from {result['language_code']} to English")
-            english_text = convert_to_english(result["text"], result["language_code"])
+        extraction = await run_in_threadpool(
+            extract_all_fields_with_crewai,
+            field_specs,
+            result["text"],
+            result["language_code"]
+        )
         
         return {
             "transcription": result["text"],
             "language_code": result["language_code"],
             "confidence": result["confidence"],
-            "english_text": english_text,
-            "audio_file_id": file_id
+            "translated_text": extraction["translated_text"],
+            "fields": extraction["fields"],
+            "audio_preprocessing": result["preprocessing"]
         }
     except HTTPException:
         raise
+    except Exception as e:
+        print(f"Error in transcribe_for_form_multi: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error processing audio: {str(e)}")
+
+@app.post("/api/transcribe-qna", dependencies=[Depends(form_deadline)])
+async def transcribe_for_qna(
+    audio_file: UploadFile = File(...),
+    language: str = Form("auto")
+):
+    """Transcribe audio for Q&A"""
+    try:
+        return await transcribe_qna_audio(audio_file, language)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in transcribe_for_qna: {str(e)}")
         import traceback
         traceback.print_exc()
-        # Don't delete file on error - user may want to retry
         raise HTTPException(status_code=500, detail=f"Error processing Q&A audio: {str(e)}")
 
-@app.post("/api/process-qna")
+@app.post("/api/process-qna", dependencies=[Depends(form_deadline)])
 async def process_qna(
     question: str = Form(...),
     answer: str = Form(...),
     language_code: str = Form("en")
 ):
     """Process Q&A answer with AI analysis"""
-    result = process_answer_with_crewai(question, answer, language_code)
+    result = await run_in_threadpool(process_answer_with_crewai, question, answer, language_code)
     return result
 
-@app.post("/api/save-form")
-async def save_form(form_data: Dict):
-    """Save form data as JSON"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"form_data_{timestamp}.json"
+@app.post("/api/process-qna-batch", dependencies=[Depends(form_deadline)])
+async def process_qna_batch(
+    items: str = Form(...),
+    audio_files: List[UploadFile] = File([]),
+    language: str = Form("auto"),
+    concurrency: int = Form(BATCH_MAX_CONCURRENCY)
+):
+    """Process a whole Q&A session at once, streaming one NDJSON result per answer as it finishes.
+
+    `items` is a JSON list of {"index", "question"} objects carrying either an
+    "answer" (text, with optional "language_code") or an "audio_index" into
+    `audio_files`. The request timeout (header or `timeout` field) applies to
+    each answer on its own, from when that answer starts processing.
+    """
+    try:
+        batch = json.loads(items)
+        assert isinstance(batch, list) and all(isinstance(item, dict) and item.get("question") for item in batch)
+    except Exception:
+        raise HTTPException(status_code=400, detail="items must be a JSON list of objects with a question")
+    for item in batch:
+        audio_index = item.get("audio_index")
+        if audio_index is None and not item.get("answer"):
+            raise HTTPException(status_code=400, detail=f"Item {item.get('index')} needs an answer or audio_index")
+        if audio_index is not None and not (isinstance(audio_index, int) and 0 <= audio_index < len(audio_files)):
+            raise HTTPException(status_code=400, detail=f"Item {item.get('index')} has an invalid audio_index")
+    
+    semaphore = asyncio.Semaphore(max(1, min(concurrency, BATCH_MAX_CONCURRENCY)))
+    # Each answer gets the request's deadline to itself, counted from when it starts (as jobs do):
+    # a session longer than one round of BATCH_MAX_CONCURRENCY would otherwise time out its later answers
+    request_deadline = current_deadline.get()
+    item_seconds = request_deadline.seconds if request_deadline is not None else REQUEST_DEADLINE
+    item_deadlines = []
+    
+    async def process_item(position: int, item: Dict):
+        index = item.get("index", position)
+        async with semaphore:
+            deadline = Deadline(item_seconds)
+            item_deadlines.append(deadline)
+            token = current_deadline.set(deadline)
+            try:
+                if item.get("audio_index") is not None:
+                    transcription = await transcribe_qna_audio(audio_files[item["audio_index"]], language)
+                    # Already converted to English, so the Q&A crew skips its translate task
+                    answer, answer_language = transcription["english_text"], "en"
+                else:
+                    transcription = {
+                        "transcription": item["answer"],
+                        "language_code": item.get("language_code", "en"),
+                        "confidence": None,
+                        "english_text": item["answer"],
+                        "audio_file_id": None
+                    }
+                    answer, answer_language = item["answer"], transcription["language_code"] or "en"
+                analysis = await run_in_threadpool(
+                    process_answer_with_crewai, item["question"], answer, answer_language
+                )
+                return {"index": index, "status": "success", "question": item["question"], **transcription, **analysis}
+            except HTTPException as e:
+                return {"index": index, "status": "error", "question": item["question"], "detail": e.detail,
+                        "audio_file_id": (e.headers or {}).get("X-Audio-File-Id")}
+            except Exception as e:
+                print(f"Error in process_qna_batch item {index}: {str(e)}")
+                return {"index": index, "status": "error", "question": item["question"], "detail": str(e)}
+            finally:
+                current_deadline.reset(token)
+    
+    async def stream_results():
+        tasks = [asyncio.create_task(process_item(position, item)) for position, item in enumerate(batch)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield json.dumps(await finished, ensure_ascii=False) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Crews running in threads stop at their next deadline check
+            for deadline in item_deadlines:
+                deadline.cancel("batch cancelled")
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+@app.post("/api/audio/{audio_file_id}/retry", dependencies=[Depends(form_deadline)])
+async def retry_qna_audio(
+    audio_file_id: str,
+    language: str = Form("auto"),
+    question: Optional[str] = Form(None)
+):
+    """
+    Re-run transcription (and the AI analysis, when `question` is given) for a retained Q&A
+    recording. The audio is not sent again: its AssemblyAI upload is reused when known.
+    """
+    entry = audio_store.get(audio_file_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Recording not found or already evicted")
+    result = await transcribe_audio(
+        ASSEMBLYAI_API_KEY, entry["path"], language, speaker_labels=True, upload_url=entry["upload_url"],
+        on_upload=lambda upload_url: audio_store.remember_upload(audio_file_id, upload_url)
+    )
+    payload = await qna_transcription_payload(audio_file_id, result)
+    if question:
+        payload.update(await run_in_threadpool(
+            process_answer_with_crewai, question, payload["english_text"], "en"
+        ))
+    return payload
+
+@app.get("/api/audio/stats")
+async def audio_store_stats():
+    """Retained recording count, size and evictions"""
+    return audio_store.stats()
+
+@app.get("/api/upstream/limits")
+async def upstream_limits():
+    """Shared upstream limits: configured and adapted rates, requests in flight, 429s and time spent throttled"""
+    return await run_in_threadpool(upstream_limiter.stats)
+
+@app.websocket("/ws/transcribe-live")
+async def transcribe_live(websocket: WebSocket):
+    """Live transcription while the user speaks.
+
+    The client sends a JSON start message ({"type": "start", "mode": "form" |
+    "form-multi" | "qna", "sample_rate", "language", plus "field_name" / "field_id", "fields"
+    or "question"}), then binary 16-bit PCM chunks, then {"type": "stop"}. The
+    server pushes partial/final transcripts as they arrive and, once the final
+    transcript is in, the extraction or analysis result.
+    """
+    await websocket.accept()
+    backend = None
+    pump = None
+    try:
+        options = await websocket.receive_json()
+        if options.get("type") != "start":
+            await websocket.send_json({"type": "error", "detail": "First message must be a start message"})
+            return
+        language = options.get("language", "auto")
+        
+        backend = create_streaming_backend()
+        await backend.start(int(options.get("sample_rate", 16000)), language)
+        finals = []
+        
+        async def pump_transcripts():
+            async for event in backend.events():
+                if event["type"] == "final" and event["text"]:
+                    finals.append(event["text"])
+                await websocket.send_json(event)
+        
+        pump = asyncio.create_task(pump_transcripts())
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                await backend.send_audio(message["bytes"])
+            elif message.get("text") and json.loads(message["text"]).get("type") == "stop":
+                break
+        
+        await backend.finish()
+        await asyncio.wait_for(pump, timeout=LIVE_FINAL_TIMEOUT)
+        transcript = " ".join(finals).strip()
+        # Undetected languages stay "auto", so the text is routed through translation rather than assumed English
+        language_code = backend.language_code or language
+        if not transcript:
+            await websocket.send_json({"type": "error",
+                                       "detail": "No speech detected in the audio. Please ensure you speak clearly."})
+            return
+        await websocket.send_json({"type": "transcript", "text": transcript, "language_code": language_code})
+        
+        result = await live_transcript_result(options, transcript, language_code)
+        await websocket.send_json({"type": "result", "transcription": transcript,
+                                   "language_code": language_code, **result})
+    except WebSocketDisconnect:
+        pass
+    except asyncio.TimeoutError:
+        await websocket.send_json({"type": "error", "detail": "Timed out waiting for the final transcript"})
+    except HTTPException as e:
+        await websocket.send_json({"type": "error", "detail": e.detail})
+    except Exception as e:
+        print(f"Error in transcribe_live: {str(e)}")
+        await websocket.send_json({"type": "error", "detail": f"Live transcription error: {str(e)}"})
+    finally:
+        if pump is not None:
+            pump.cancel()
+        if backend is not None:
+            await backend.close()
+        try:
+            await websocket.close()
+        except RuntimeError:
+            pass
+
+@app.post("/api/jobs/transcribe-form", dependencies=[Depends(form_deadline)])
+async def submit_form_job(
+    audio_file: UploadFile = File(...),
+    field_name: str = Form(...),
+    language: str = Form("auto"),
+    field_id: Optional[str] = Form(None)
+):
+    """Queue /api/transcribe-form as a background job and return its id immediately"""
+    file_path = audio_store.job_path()
+    try:
+        await save_upload(audio_file, file_path)
+        job = job_manager.submit("transcribe-form", form_job_pipeline(file_path, field_name, language, field_id))
+    except BaseException:
+        # An interrupted upload or a full queue: no pipeline will ever delete the file
+        AudioStore._delete([file_path])
+        raise
+    return job_accepted(job)
+
+@app.post("/api/jobs/transcribe-form-multi", dependencies=[Depends(form_deadline)])
+async def submit_form_multi_job(
+    audio_file: UploadFile = File(...),
+    fields: str = Form(...),
+    language: str = Form("auto")
+):
+    """Queue /api/transcribe-form-multi as a background job and return its id immediately"""
+    try:
+        field_specs = [FormFieldSpec(**field) for field in json.loads(fields)]
+    except Exception:
+        raise HTTPException(status_code=400, detail="fields must be a JSON list of {id, name} objects")
+    if not field_specs:
+        raise HTTPException(status_code=400, detail="At least one field is required")
+    file_path = audio_store.job_path()
+    try:
+        await save_upload(audio_file, file_path)
+        job = job_manager.submit("transcribe-form-multi", form_multi_job_pipeline(file_path, field_specs, language))
+    except BaseException:
+        AudioStore._delete([file_path])
+        raise
+    return job_accepted(job)
+
+@app.post("/api/jobs/transcribe-qna", dependencies=[Depends(form_deadline)])
+async def submit_qna_job(
+    audio_file: UploadFile = File(...),
+    language: str = Form("auto"),
+    question: Optional[str] = Form(None)
+):
+    """Queue Q&A transcription (and analysis, when `question` is given) as a background job"""
+    file_id = str(uuid.uuid4())
+    file_path = audio_store.path_for(file_id)
+    try:
+        await save_upload(audio_file, file_path)
+    except BaseException:
+        AudioStore._delete([file_path])
+        raise
+    await audio_store.add(file_id)
+    job = job_manager.submit("transcribe-qna", qna_job_pipeline(file_id, file_path, language, question))
+    return job_accepted(job)
+
+@app.get("/api/jobs")
+async def job_stats():
+    """Queue depth, worker count and job counts by status"""
+    return job_manager.stats()
+
+@app.get("/api/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Current status, progress events and (when finished) the result of a job"""
+    return job_manager.get(job_id).snapshot()
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-Sent Events stream of a job's progress, ending with its result or error"""
+    job = job_manager.get(job_id)
     
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(form_data, f, indent=4)
+    async def stream_events():
+        sent = 0
+        while True:
+            while sent < len(job.events):
+                yield f"event: progress\ndata: {json.dumps(job.events[sent], ensure_ascii=False)}\n\n"
+                sent += 1
+            if job.finished:
+                final = {"result": job.result} if job.status == "completed" else {"error": job.error}
+                yield f"event: {job.status}\ndata: {json.dumps(final, ensure_ascii=False)}\n\n"
+                return
+            try:
+                await job.wait_for_change(timeout=15)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
     
-    return {"status": "success", "filename": filename}
+    return StreamingResponse(stream_events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.post("/api/save-form")
+async def save_form(form_data: Dict):
+    """Save form data to the session store"""
+    saved = await session_store.save(
+        "form", form_data,
+        property_address=form_value(form_data, "Property Address"),
+        inspector_name=form_value(form_data, "Inspector Name")
+    )
+    return {"status": "success", "filename": saved["filename"], "session_id": saved["id"]}
 
 @app.post("/api/save-qna")
 async def save_qna(qna_data: Dict):
-    """Save Q&A analysis as JSON"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"qna_analysis_{timestamp}.json"
-    
+    """Save Q&A analysis to the session store"""
     # Add session info
     full_data = {
         "session_info": {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "total_questions": len(qna_data.get("questions_and_answers", [])),
-            "analysis_type": "Property Q&A Analysis"
+            "analysis_type": "Property Q&A Analysis",
+            "property_address": qna_data.get("property_address"),
+            "inspector_name": qna_data.get("inspector_name")
         },
         "questions_and_answers": qna_data.get("questions_and_answers", [])
     }
     
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(full_data, f, indent=2, ensure_ascii=False)
-    
-    return {"status": "success", "filename": filename}
+    saved = await session_store.save(
+        "qna", full_data,
+        property_address=qna_data.get("property_address"),
+        inspector_name=qna_data.get("inspector_name")
+    )
+    return {"status": "success", "filename": saved["filename"], "session_id": saved["id"]}
+
+def session_filters(kind: Optional[str], address: Optional[str], inspector: Optional[str],
+                    since: Optional[str], until: Optional[str]) -> Dict:
+    """Query-string filters for listing and exporting sessions (dates are ISO 8601)"""
+    if kind not in (None, "form", "qna"):
+        raise HTTPException(status_code=400, detail="kind must be 'form' or 'qna'")
+    filters = {"kind": kind, "address": address, "inspector": inspector}
+    for name, value in (("since", since), ("until", until)):
+        if value:
+            try:
+                filters[name] = datetime.fromisoformat(value).timestamp()
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"{name} must be an ISO 8601 date or datetime")
+    return filters
+
+@app.get("/api/sessions")
+async def list_sessions(kind: Optional[str] = None, address: Optional[str] = None,
+                        inspector: Optional[str] = None, since: Optional[str] = None,
+                        until: Optional[str] = None, limit: int = 50, cursor: Optional[str] = None):
+    """
+    List saved sessions, newest first. `address` matches a prefix of the property address,
+    `inspector` the exact name (both case-insensitive). Pass `next_cursor` back as `cursor`
+    to fetch the next page.
+    """
+    limit = max(1, min(limit, SESSION_PAGE_MAX))
+    filters = session_filters(kind, address, inspector, since, until)
+    try:
+        items = await session_store.page(filters, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    next_cursor = SessionStore.cursor_for(items[-1]) if len(items) == limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+@app.get("/api/sessions/export")
+async def export_sessions(format: str = "ndjson", kind: Optional[str] = None, address: Optional[str] = None,
+                          inspector: Optional[str] = None, since: Optional[str] = None,
+                          until: Optional[str] = None):
+    """Stream every matching session as NDJSON or CSV"""
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+    filters = session_filters(kind, address, inspector, since, until)
+
+    async def ndjson_lines():
+        async for session in session_store.iter_all(filters):
+            yield json.dumps(session, ensure_ascii=False) + "\n"
+
+    async def csv_lines():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(SESSION_EXPORT_COLUMNS)
+        async for session in session_store.iter_all(filters):
+            session["created_at"] = session.pop("created_at_iso")
+            session["data"] = json.dumps(session["data"], ensure_ascii=False)
+            writer.writerow([session[column] for column in SESSION_EXPORT_COLUMNS])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    filename = f"sessions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if format == "csv":
+        return StreamingResponse(csv_lines(), media_type="text/csv", headers=headers)
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson", headers=headers)
+
+@app.get("/api/sessions/{session_id}")
+async def get_session(session_id: str):
+    """A saved session with its full data"""
+    session = await session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
 
 @app.get("/api/download/{filename}")
 async def download_file(filename: str):
-    """Download generated file"""
+    """Download a saved session, or a file written by earlier versions"""
+    session = await session_store.get_by_filename(filename)
+    if session is not None:
+        indent = 4 if session["kind"] == "form" else 2
+        content = json.dumps(session["data"], indent=indent, ensure_ascii=False)
+        return Response(content, media_type="application/json",
+                        headers={"Content-Disposition": f'attachment; filename="{filename}"'})
     if os.path.exists(filename):
         return FileResponse(filename, filename=filename)
     raise HTTPException(status_code=404, detail="File not found")
@@ -0,0 +1,119 @@
+"""
+Audio preprocessing cost vs upload time saved.
+
+Synthesizes sample recordings shaped like what browsers send (webm/opus at
+48 kHz stereo, and PCM wav at 44.1 kHz) with leading/trailing silence, then
+for each clip reports the decode, VAD and encode cost of normalize_audio and
+the end-to-end transcription time with preprocessing off and on against a
+local AssemblyAI stand-in whose uploads are throttled to a slow uplink.
+
+    python benchmarks/bench_audio_preprocessing.py --uplink-kbps 1000
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+
+import av
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_assemblyai import BackgroundServer, create_fake_assemblyai
+
+# (name, container, codec, sample rate, leading silence s, speech s, trailing silence s)
+CLIPS = [
+    ("short-webm", "webm", "libopus", 48000, 1.0, 3.0, 1.5),
+    ("long-webm", "webm", "libopus", 48000, 2.0, 40.0, 4.0),
+    ("short-wav", "wav", "pcm_s16le", 44100, 1.0, 3.0, 1.5),
+    ("long-wav", "wav", "pcm_s16le", 44100, 2.0, 40.0, 4.0),
+]
+
+
+def synthesize(container_format: str, codec: str, rate: int, lead: float, speech: float, tail: float) -> bytes:
+    """Stereo clip: low room noise, a speech-like modulated tone, then room noise again"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(rate * speech)) / rate
+    voiced = 0.3 * np.sin(2 * np.pi * 220 * t) * np.abs(np.sin(2 * np.pi * 2.5 * t))
+    signal = np.concatenate([rng.normal(0, 0.001, int(rate * lead)), voiced,
+                             rng.normal(0, 0.001, int(rate * tail))]).astype(np.float32)
+    stereo = np.stack([signal, signal])
+    buffer = io.BytesIO()
+    with av.open(buffer, "w", format=container_format) as container:
+        stream = container.add_stream(codec, rate=rate)
+        stream.layout = "stereo"
+        if codec == "libopus":
+            frame = av.AudioFrame.from_ndarray(stereo, format="fltp", layout="stereo")
+        else:
+            pcm = (stereo.T.reshape(1, -1) * 32767).astype(np.int16)
+            frame = av.AudioFrame.from_ndarray(pcm, format="s16", layout="stereo")
+        frame.sample_rate = rate
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return buffer.getvalue()
+
+
+async def transcribe_both_ways(app_fastapi, path: str) -> dict:
+    """End-to-end transcription time with preprocessing off and on (cache cleared in between)"""
+    timings = {}
+    for enabled in (False, True):
+        app_fastapi.AUDIO_NORMALIZE = enabled
+        app_fastapi.transcript_cache.memory.clear()
+        start = time.perf_counter()
+        await app_fastapi.transcribe_audio("test-key", path, "en")
+        timings[enabled] = time.perf_counter() - start
+    return timings
+
+
+async def run_clips(app_fastapi, paths: list) -> list:
+    try:
+        return [await transcribe_both_ways(app_fastapi, path) for path in paths]
+    finally:
+        await app_fastapi.assemblyai_client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uplink-kbps", type=float, default=1000, help="Simulated upload bandwidth")
+    args = parser.parse_args()
+
+    fake = create_fake_assemblyai(processing_time=0, upload_bytes_per_second=args.uplink_kbps * 1000 / 8)
+    with BackgroundServer(fake) as fake_server, tempfile.TemporaryDirectory() as tmp:
+        os.environ["ASSEMBLYAI_BASE_URL"] = fake_server.url
+        import app_fastapi
+
+        print(f"uplink {args.uplink_kbps:.0f} kbit/s, codec {app_fastapi.AUDIO_ENCODE_CODEC}")
+        print(f"{'clip':11s} {'bytes':>9s} {'->':>2s} {'bytes':>8s} {'trimmed':>8s} {'decode':>8s} {'vad':>7s} "
+              f"{'encode':>8s} {'e2e off':>8s} {'e2e on':>8s} {'saved':>7s}")
+        paths, rows = [], []
+        for name, container_format, codec, rate, lead, speech, tail in CLIPS:
+            path = os.path.join(tmp, f"{name}.{container_format}")
+            with open(path, "wb") as f:
+                f.write(synthesize(container_format, codec, rate, lead, speech, tail))
+
+            with tempfile.TemporaryFile() as pcm:
+                start = time.perf_counter()
+                energy_db, sample_count = app_fastapi.frame_energies(
+                    app_fastapi.spool_blocks(app_fastapi.iter_mono_blocks(path), pcm))
+                decoded = time.perf_counter()
+                begin, end = app_fastapi.voiced_bounds(energy_db, sample_count)
+                vad = time.perf_counter()
+                app_fastapi.encode_audio(app_fastapi.read_pcm_blocks(pcm, begin, end))
+                encoded = time.perf_counter()
+            _, stats = app_fastapi.normalize_audio(path)
+            paths.append(path)
+            rows.append((name, stats, decoded - start, vad - decoded, encoded - vad))
+
+        for (name, stats, decode, vad, encode), timings in zip(rows, asyncio.run(run_clips(app_fastapi, paths))):
+            print(f"{name:11s} {stats['original_bytes']:9d} -> {stats['uploaded_bytes']:8d} "
+                  f"{stats['trimmed_seconds']:7.2f}s {decode * 1000:6.1f}ms {vad * 1000:5.1f}ms "
+                  f"{encode * 1000:6.1f}ms {timings[False]:7.2f}s {timings[True]:7.2f}s "
+                  f"{timings[False] - timings[True]:6.2f}s")
+
+if __name__ == "__main__":
+    main()
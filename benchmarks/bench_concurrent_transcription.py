@@ -0,0 +1,71 @@
+"""
+Concurrent transcription benchmark against a local AssemblyAI stand-in.
+
+Runs N transcriptions at once on a single event loop. With the async client,
+N concurrent recordings should take about as long as one. Every call gets its
+own random recording, so none of them is answered from the transcript cache,
+and the upstream rate limits are lifted so they don't pace the uploads.
+
+    python benchmarks/bench_concurrent_transcription.py --concurrency 10 --processing-time 2
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_assemblyai import BackgroundServer, create_fake_assemblyai
+
+
+def write_recordings(directory: str, count: int, audio_bytes: int) -> list:
+    """Distinct recordings, so each transcription misses the transcript cache"""
+    paths = []
+    for _ in range(count):
+        with tempfile.NamedTemporaryFile(suffix=".wav", dir=directory, delete=False) as f:
+            f.write(os.urandom(audio_bytes))
+            paths.append(f.name)
+    return paths
+
+
+async def run_batch(app_module, audio_paths: list) -> float:
+    hits = app_module.transcript_cache.memory.hits + app_module.transcript_cache.disk_hits
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        app_module.transcribe_audio("test-key", audio_path, "en")
+        for audio_path in audio_paths
+    ])
+    elapsed = time.perf_counter() - start
+    await app_module.assemblyai_client.aclose()
+    if app_module.transcript_cache.memory.hits + app_module.transcript_cache.disk_hits != hits:
+        raise RuntimeError("a transcription was answered from the transcript cache")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--processing-time", type=float, default=2.0)
+    parser.add_argument("--audio-bytes", type=int, default=256 * 1024)
+    args = parser.parse_args()
+
+    with BackgroundServer(create_fake_assemblyai(processing_time=args.processing_time)) as server:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ.update(ASSEMBLYAI_BASE_URL=server.url, UPSTREAM_LIMITS_DB=os.path.join(tmp, "limits.db"),
+                              ASSEMBLYAI_UPLOAD_RATE="1000", ASSEMBLYAI_TRANSCRIPT_RATE="1000",
+                              ASSEMBLYAI_POLL_RATE="1000")
+            import app_fastapi
+
+            single = asyncio.run(run_batch(app_fastapi, write_recordings(tmp, 1, args.audio_bytes)))
+            concurrent = asyncio.run(run_batch(app_fastapi, write_recordings(tmp, args.concurrency,
+                                                                             args.audio_bytes)))
+
+    print(f"1 transcription:              {single:.2f}s")
+    print(f"{args.concurrency} concurrent transcriptions: {concurrent:.2f}s")
+    print(f"ratio:                        {concurrent / single:.2f}x (1.00x is ideal)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Per-request CrewAI setup overhead: building clients/agents/crews every request
+versus checking them out of the process-wide crew registry.
+
+No LLM calls are made; only the work done before `kickoff` reaches the network
+(client, agent and crew construction plus input interpolation) is timed.
+
+    python benchmarks/bench_crew_construction.py --iterations 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import app_fastapi
+from langchain_openai import ChatOpenAI
+
+CREWS = {
+    "translation": ({"text": "Hola, me llamo Ana.", "language_code": "es"}, 0.1),
+    "extraction": ({"text": "My name is Ana Lopez.", "field_name": "Inspector Name"}, 0.1),
+    "qna": ({"question": "What is the asking price?", "answer": "Está a la venta por 450 mil.", "language_code": "es"},
+            0.2),
+    "qna_english": ({"question": "What is the asking price?", "answer": "It is listed at 450k.", "language_code": "en"},
+                    0.2),
+}
+
+
+def per_request(name: str, inputs: dict, temperature: float):
+    llm = ChatOpenAI(api_key=app_fastapi.OPENAI_API_KEY, model_name=app_fastapi.OPENAI_MODEL, temperature=temperature)
+    crew = app_fastapi.crew_registry._builders[name](llm)
+    crew._interpolate_inputs(inputs)
+
+
+def registry(name: str, inputs: dict, temperature: float):
+    with app_fastapi.crew_registry.checkout(name, temperature=temperature) as crew:
+        crew._interpolate_inputs(inputs)
+
+
+def measure(fn, name: str, inputs: dict, temperature: float, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(name, inputs, temperature)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'crew':12s} {'per-request p50':>16s} {'registry p50':>13s} {'speedup':>8s}")
+    for name, (inputs, temperature) in CREWS.items():
+        registry(name, inputs, temperature)  # warm the pool
+        before = statistics.median(measure(per_request, name, inputs, temperature, args.iterations))
+        after = statistics.median(measure(registry, name, inputs, temperature, args.iterations))
+        print(f"{name:12s} {before:14.3f}ms {after:11.3f}ms {before / after:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
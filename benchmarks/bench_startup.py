@@ -0,0 +1,117 @@
+"""
+Cold start: how long importing app_fastapi takes, and how long after launching
+uvicorn the first byte of `/` and `/api/config` arrives. With the warmup on it
+also reports when the AI stack (CrewAI + langchain) finished loading in the
+background, as seen through /api/config's `ai_ready`.
+
+    python benchmarks/bench_startup.py --runs 3
+"""
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_profile(env: dict) -> tuple:
+    """Cumulative import time of app_fastapi and its heaviest top-level imports, in seconds"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app_fastapi"],
+                          cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    total, top_level = 0.0, {}
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, module = int(match.group(2)) / 1e6, len(match.group(3)) // 2, match.group(4)
+        if module == "app_fastapi":
+            total = cumulative
+        elif depth == 1:
+            top_level[module] = cumulative
+    heaviest = sorted(top_level.items(), key=lambda item: -item[1])[:5]
+    return total, heaviest
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def first_byte(client: httpx.Client, url: str, proc: subprocess.Popen, timeout: float = 120.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("app exited during startup")
+        try:
+            with client.stream("GET", url) as response:
+                next(response.iter_raw(), None)
+                return response
+        except httpx.TransportError:
+            time.sleep(0.01)
+    raise RuntimeError(f"no response from {url}")
+
+
+def cold_start(env: dict, warmup: bool) -> dict:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app_fastapi:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env={**env, "AI_WARMUP": str(warmup).lower()},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(timeout=30) as client:
+            first_byte(client, f"{base}/", proc)
+            page = time.perf_counter() - start
+            first_byte(client, f"{base}/api/config", proc)
+            config_time = time.perf_counter() - start
+            ai_ready = None
+            if warmup:
+                while not client.get(f"{base}/api/config").json().get("ai_ready"):
+                    if time.perf_counter() - start > 120:
+                        break
+                    time.sleep(0.05)
+                else:
+                    ai_ready = time.perf_counter() - start
+    finally:
+        proc.terminate()
+        proc.wait()
+    return {"page": page, "config": config_time, "ai_ready": ai_ready}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    env = dict(os.environ, OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "sk-benchmark"),
+               SESSION_DB=os.path.join(workdir, "sessions.db"))
+
+    total, heaviest = import_profile(env)
+    print(f"import app_fastapi: {total:.2f}s")
+    for module, seconds in heaviest:
+        print(f"  {module:24s} {seconds:.2f}s")
+
+    for warmup in (False, True):
+        runs = [cold_start(env, warmup) for _ in range(args.runs)]
+        print(f"\nAI_WARMUP={str(warmup).lower()} (median of {args.runs})")
+        print(f"  first byte of /           {statistics.median(r['page'] for r in runs):.2f}s")
+        print(f"  first byte of /api/config {statistics.median(r['config'] for r in runs):.2f}s")
+        ready = [r["ai_ready"] for r in runs if r["ai_ready"] is not None]
+        if ready:
+            print(f"  AI stack ready            {statistics.median(ready):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Peak memory of the app while streaming large uploads to a local AssemblyAI stand-in.
+
+Runs the app in a uvicorn subprocess, posts WAV recordings (48 kHz stereo, a
+tone between stretches of silence) of increasing length to /api/transcribe-qna
+and reads the worker's peak RSS (VmHWM, Linux only) during each one, so the
+upload, hashing and audio preprocessing are all covered. With streaming uploads
+and block-wise preprocessing the peak stays flat regardless of recording
+length; the exit status is 1 when the peak for the longest recording exceeds
+the shortest one's by more than --tolerance-mb. tests/test_upload_memory.py
+runs a shorter version under pytest.
+
+    python benchmarks/bench_upload_memory.py --minutes 2 10 30
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+import httpx
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_assemblyai import BackgroundServer, create_fake_assemblyai
+from load_test import free_port, wait_until_up
+
+
+def peak_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmHWM not available")
+
+
+def reset_peak_rss(pid: int):
+    """Restart VmHWM tracking so each upload reports its own peak (Linux 4.0+)"""
+    with open(f"/proc/{pid}/clear_refs", "w") as f:
+        f.write("5")
+
+
+def write_recording(path: str, minutes: float, rate: int = 48000):
+    """Stereo 16-bit WAV: 5s of silence, a 220 Hz tone, 5s of silence, written a second at a time"""
+    tone = (0.3 * np.sin(2 * np.pi * 220 * np.arange(rate) / rate) * 32767).astype(np.int16)
+    silence = np.zeros(rate, dtype=np.int16)
+    seconds = int(minutes * 60)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        for second in range(seconds):
+            samples = tone if 5 <= second < seconds - 5 else silence
+            f.writeframes(np.stack([samples, samples], axis=1).tobytes())
+
+
+def upload(url: str, path: str):
+    with open(path, "rb") as f:
+        response = httpx.post(f"{url}/api/transcribe-qna", data={"language": "en"},
+                              files={"audio_file": ("big.wav", f, "audio/wav")}, timeout=600)
+    response.raise_for_status()
+
+
+def measure_peaks(minutes_list) -> list:
+    """Peak RSS in MB of the app while it handles each recording length, shortest first"""
+    with BackgroundServer(create_fake_assemblyai(processing_time=0.1)) as fake, \
+            tempfile.TemporaryDirectory() as workdir:
+        port = free_port()
+        env = dict(os.environ, ASSEMBLYAI_BASE_URL=fake.url, ASSEMBLYAI_API_KEY="test-key", AI_WARMUP="false")
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app_fastapi:app", "--app-dir", ROOT, "--port", str(port),
+             "--log-level", "warning"],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL,
+        )
+        url = f"http://127.0.0.1:{port}"
+        peaks = []
+        try:
+            wait_until_up(url, proc, warmup=False)
+            print(f"baseline peak RSS: {peak_rss_mb(proc.pid):.1f} MB")
+            for minutes in sorted(minutes_list):
+                path = os.path.join(workdir, f"recording-{minutes}.wav")
+                write_recording(path, minutes)
+                size_mb = os.path.getsize(path) / 1024 / 1024
+                reset_peak_rss(proc.pid)
+                start = time.perf_counter()
+                upload(url, path)
+                elapsed = time.perf_counter() - start
+                os.remove(path)
+                peaks.append(peak_rss_mb(proc.pid))
+                print(f"{minutes:5.1f} min ({size_mb:6.1f} MB) upload: {elapsed:6.2f}s  peak RSS {peaks[-1]:.1f} MB")
+        finally:
+            proc.terminate()
+            proc.wait()
+    return peaks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[2, 10, 30])
+    parser.add_argument("--tolerance-mb", type=float, default=40,
+                        help="Allowed growth in peak RSS from the shortest to the longest recording")
+    args = parser.parse_args()
+
+    peaks = measure_peaks(args.minutes)
+    growth = peaks[-1] - peaks[0]
+    print(f"peak RSS growth from shortest to longest: {growth:+.1f} MB (tolerance {args.tolerance_mb:.0f} MB)")
+    if growth > args.tolerance_mb:
+        print("FAIL: peak memory grows with recording length")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
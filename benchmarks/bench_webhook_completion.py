@@ -0,0 +1,60 @@
+"""
+Polling vs webhook completion against a local AssemblyAI stand-in.
+
+Starts the fake AssemblyAI and the app itself, then transcribes through
+/api/transcribe-qna in both modes and reports latency and upstream request
+counts. In webhook mode the fake fires the callback into the app, which wakes
+the waiting request.
+
+    python benchmarks/bench_webhook_completion.py --requests 20 --processing-time 1.3
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_assemblyai import BackgroundServer, create_fake_assemblyai
+
+
+async def drive(app_url: str, requests: int) -> list:
+    async with httpx.AsyncClient(base_url=app_url, timeout=60) as client:
+        async def one():
+            start = time.perf_counter()
+            response = await client.post("/api/transcribe-qna", data={"language": "en"},
+                                         files={"audio_file": ("a.wav", os.urandom(4096), "audio/wav")})
+            response.raise_for_status()
+            return time.perf_counter() - start
+        return await asyncio.gather(*[one() for _ in range(requests)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--processing-time", type=float, default=1.3)
+    args = parser.parse_args()
+
+    fake = create_fake_assemblyai(processing_time=args.processing_time)
+    with BackgroundServer(fake) as fake_server:
+        os.environ["ASSEMBLYAI_BASE_URL"] = fake_server.url
+        os.environ.setdefault("ASSEMBLYAI_API_KEY", "test-key")
+        os.environ.setdefault("ASSEMBLYAI_WEBHOOK_SECRET", "test-secret")
+        import app_fastapi
+
+        with BackgroundServer(app_fastapi.app) as app_server:
+            for mode, public_url in (("polling", ""), ("webhook", app_server.url)):
+                app_fastapi.PUBLIC_BASE_URL = public_url
+                before = dict(fake.state.request_counts)
+                latencies = sorted(asyncio.run(drive(app_server.url, args.requests)))
+                polls = fake.state.request_counts["poll"] - before["poll"]
+                webhooks = fake.state.request_counts["webhook"] - before["webhook"]
+                print(f"{mode:8s} mean={sum(latencies) / len(latencies):.2f}s "
+                      f"max={latencies[-1]:.2f}s  GET /v2/transcript={polls}  webhooks={webhooks}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Request deadlines against deliberately slow stand-ins: a transcript that never
+finishes, a crawling upload, a slow LLM, a client that hangs up mid-request and
+a background job. Each scenario runs the app in a uvicorn subprocess and checks
+that the request fails fast with a 504 naming the stage that ran out of time
+(and, for the disconnect, that polling upstream stops), then that a healthy
+request still succeeds. Exits non-zero if any scenario fails; tests/test_deadlines.py runs the same
+scenarios under pytest.
+
+    python benchmarks/deadline_scenarios.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_assemblyai import BackgroundServer, create_fake_assemblyai
+from fake_openai import create_fake_openai
+from load_test import free_port, recording, wait_until_up
+
+
+class App:
+    """The app in a uvicorn subprocess, pointed at the given stand-ins"""
+
+    def __init__(self, assemblyai, openai):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.env = dict(os.environ, ASSEMBLYAI_BASE_URL=assemblyai.url, ASSEMBLYAI_API_KEY="test-key",
+                        OPENAI_API_KEY="test-key", OPENAI_BASE_URL=f"{openai.url}/v1",
+                        OPENAI_API_BASE=f"{openai.url}/v1", ASSEMBLYAI_POLL_MAX_DELAY="0.5")
+
+    def __enter__(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app_fastapi:app", "--app-dir", ROOT, "--port", str(self.port),
+             "--log-level", "warning"],
+            cwd=self.workdir.name, env=self.env, stdout=subprocess.DEVNULL,
+        )
+        wait_until_up(self.url, self.proc, warmup=True)
+        return self
+
+    def __exit__(self, *exc):
+        self.proc.terminate()
+        self.proc.wait()
+        self.workdir.cleanup()
+
+
+def polls_made(assemblyai: BackgroundServer) -> int:
+    return assemblyai.config.app.state.request_counts["poll"]
+
+
+def post_audio(url: str, path: str, headers: dict = None, data: dict = None, timeout: float = 60):
+    start = time.perf_counter()
+    response = httpx.post(f"{url}{path}", data={"language": "en", **(data or {})}, headers=headers,
+                          files={"audio_file": ("recording.wav", recording(), "audio/wav")}, timeout=timeout)
+    return response, time.perf_counter() - start
+
+
+def expect_deadline(response: httpx.Response, elapsed: float, stage: str, within: float) -> list:
+    problems = []
+    if response.status_code != 504:
+        problems.append(f"status {response.status_code}, expected 504: {response.text[:200]}")
+    elif response.headers.get("x-deadline-stage") != stage or stage not in response.json()["detail"]:
+        problems.append(f"expected stage {stage}, got {response.headers.get('x-deadline-stage')}: "
+                        f"{response.json()['detail']}")
+    if elapsed > within:
+        problems.append(f"took {elapsed:.1f}s, expected under {within:.1f}s")
+    return problems
+
+
+def stuck_transcript(assemblyai, openai) -> list:
+    """Header deadline of 3s: the transcript wait gets 60% of it, then the poll loop is cancelled"""
+    with App(assemblyai, openai) as app:
+        response, elapsed = post_audio(app.url, "/api/transcribe-qna", headers={"X-Request-Timeout": "3"})
+        polls = polls_made(assemblyai)
+        time.sleep(1.5)
+        problems = expect_deadline(response, elapsed, "assemblyai_transcript", within=3)
+        if polls_made(assemblyai) != polls:
+            problems.append("kept polling after the deadline")
+    return problems
+
+
+def slow_upload(assemblyai, openai) -> list:
+    with App(assemblyai, openai) as app:
+        response, elapsed = post_audio(app.url, "/api/transcribe-form", data={"field_name": "Inspector Name",
+                                                                             "timeout": "3"})
+    return expect_deadline(response, elapsed, "assemblyai_upload", within=2.5)
+
+
+def slow_llm(assemblyai, openai) -> list:
+    """Form-field deadline of 2s; the crew stage may use 60% of it"""
+    with App(assemblyai, openai) as app:
+        start = time.perf_counter()
+        response = httpx.post(f"{app.url}/api/process-qna", timeout=60, data={
+            "question": "What is the asking price?", "answer": "It is listed at 450k.", "language_code": "en",
+            "timeout": "2",
+        })
+        elapsed = time.perf_counter() - start
+    return expect_deadline(response, elapsed, "crew_qna_english", within=3)
+
+
+def client_disconnect(assemblyai, openai) -> list:
+    """A client that gives up after 1s: the app cancels the request and stops polling upstream"""
+    with App(assemblyai, openai) as app:
+        try:
+            post_audio(app.url, "/api/transcribe-qna", timeout=1)
+            return ["request finished before the client gave up"]
+        except httpx.TimeoutException:
+            pass
+        time.sleep(0.5)
+        polls = polls_made(assemblyai)
+        time.sleep(2)
+        problems = []
+        if polls_made(assemblyai) != polls:
+            problems.append("kept polling after the client disconnected")
+        limits = httpx.get(f"{app.url}/api/upstream/limits").json()
+        in_flight = {name: limit["in_flight"] for name, limit in limits.items() if limit["in_flight"]}
+        if in_flight:
+            problems.append(f"upstream slots still held: {in_flight}")
+    return problems
+
+
+def background_job(assemblyai, openai) -> list:
+    with App(assemblyai, openai) as app:
+        response, _ = post_audio(app.url, "/api/jobs/transcribe-qna", data={"timeout": "2"})
+        job_url = f"{app.url}{response.json()['status_url']}"
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            job = httpx.get(job_url).json()
+            if job["status"] in ("completed", "failed"):
+                break
+            time.sleep(0.2)
+    if job["status"] != "failed" or "assemblyai_transcript" not in (job["error"] or ""):
+        return [f"expected the job to fail in assemblyai_transcript, got {job['status']}: {job['error']}"]
+    return []
+
+
+def healthy(assemblyai, openai) -> list:
+    with App(assemblyai, openai) as app:
+        response, _ = post_audio(app.url, "/api/transcribe-form", data={"field_name": "Inspector Name"})
+    if response.status_code != 200:
+        return [f"status {response.status_code}: {response.text[:200]}"]
+    return []
+
+
+SCENARIOS = [
+    (stuck_transcript, {"processing_time": 3600}, {}),
+    (slow_upload, {"upload_bytes_per_second": 500}, {}),
+    (slow_llm, {}, {"latency": 10}),
+    (client_disconnect, {"processing_time": 3600}, {}),
+    (background_job, {"processing_time": 3600}, {}),
+    (healthy, {"processing_time": 0.3}, {"latency": 0.05}),
+]
+
+
+def main():
+    failed = 0
+    for scenario, assemblyai_options, openai_options in SCENARIOS:
+        with BackgroundServer(create_fake_assemblyai(**assemblyai_options)) as assemblyai, \
+                BackgroundServer(create_fake_openai(**openai_options)) as openai:
+            problems = scenario(assemblyai, openai)
+        failed += bool(problems)
+        print(f"{'FAIL' if problems else 'ok  '} {scenario.__name__}")
+        for problem in problems:
+            print(f"     {problem}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
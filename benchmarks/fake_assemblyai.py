@@ -0,0 +1,135 @@
+"""
+Local stand-in for the AssemblyAI upload / transcript / polling endpoints.
+
+Transcripts complete after a configurable processing delay so benchmarks can
+exercise the real client code without paying for API calls. When a transcript
+request carries a `webhook_url`, the completion callback is fired just like the
+real service does. `upload_bytes_per_second` throttles uploads to mimic a slow
+uplink; `request_latency` and `error_rate` add per-request delay and random
+failures for load tests.
+"""
+import asyncio
+import random
+import threading
+import time
+import uuid
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def create_fake_assemblyai(processing_time: float = 1.0, transcript_text: str = "The inspector is John Smith.",
+                           language_code: str = "en", upload_bytes_per_second: float = 0,
+                           request_latency: float = 0, error_rate: float = 0, error_status: int = 500,
+                           vary_text: bool = False):
+    """
+    Build a fake AssemblyAI app whose transcripts finish after `processing_time` seconds.
+    With `vary_text` every transcript gets a unique suffix so app-side caches never hit.
+    """
+    app = FastAPI(title="Fake AssemblyAI")
+    app.state.uploads = {}
+    app.state.transcripts = {}
+    app.state.request_counts = {"upload": 0, "transcript": 0, "poll": 0, "webhook": 0, "errors": 0}
+
+    async def simulate_network():
+        """Apply the configured latency; returns an error response for injected failures"""
+        if request_latency:
+            await asyncio.sleep(request_latency)
+        if error_rate and random.random() < error_rate:
+            app.state.request_counts["errors"] += 1
+            return JSONResponse({"error": "Injected failure"}, status_code=error_status,
+                                headers={"Retry-After": "1"} if error_status == 429 else None)
+        return None
+
+    async def fire_webhook(transcript_id: str, body: dict):
+        await asyncio.sleep(processing_time)
+        headers = {}
+        if body.get("webhook_auth_header_name"):
+            headers[body["webhook_auth_header_name"]] = body.get("webhook_auth_header_value", "")
+        if getattr(app.state, "webhook_client", None) is None:
+            app.state.webhook_client = httpx.AsyncClient()
+        await app.state.webhook_client.post(body["webhook_url"], headers=headers,
+                                            json={"transcript_id": transcript_id, "status": "completed"})
+        app.state.request_counts["webhook"] += 1
+
+    @app.post("/v2/upload")
+    async def upload(request: Request):
+        app.state.request_counts["upload"] += 1
+        failure = await simulate_network()
+        if failure:
+            return failure
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if upload_bytes_per_second:
+                await asyncio.sleep(len(chunk) / upload_bytes_per_second)
+        upload_id = str(uuid.uuid4())
+        app.state.uploads[upload_id] = size
+        return {"upload_url": f"https://cdn.fake-assemblyai.local/upload/{upload_id}"}
+
+    @app.post("/v2/transcript")
+    async def create_transcript(request: Request):
+        app.state.request_counts["transcript"] += 1
+        failure = await simulate_network()
+        if failure:
+            return failure
+        body = await request.json()
+        if not body.get("audio_url"):
+            return JSONResponse({"error": "audio_url is required"}, status_code=400)
+        transcript_id = str(uuid.uuid4())
+        transcript = app.state.transcripts[transcript_id] = {
+            "request": body,
+            "created": time.monotonic(),
+            "text": f"{transcript_text} Reference {transcript_id[:8]}." if vary_text else transcript_text,
+        }
+        if body.get("webhook_url"):
+            transcript["webhook_task"] = asyncio.create_task(fire_webhook(transcript_id, body))
+        return {"id": transcript_id, "status": "queued"}
+
+    @app.get("/v2/transcript/{transcript_id}")
+    async def get_transcript(transcript_id: str):
+        app.state.request_counts["poll"] += 1
+        failure = await simulate_network()
+        if failure:
+            return failure
+        transcript = app.state.transcripts.get(transcript_id)
+        if transcript is None:
+            return JSONResponse({"error": "Transcript not found"}, status_code=404)
+        if time.monotonic() - transcript["created"] < processing_time:
+            return {"id": transcript_id, "status": "processing"}
+        return {
+            "id": transcript_id,
+            "status": "completed",
+            "text": transcript["text"],
+            "language_code": transcript["request"].get("language_code", language_code),
+            "confidence": 0.97,
+        }
+
+    return app
+
+
+class BackgroundServer:
+    """Run an ASGI app with uvicorn on a background thread"""
+
+    def __init__(self, app, host: str = "127.0.0.1", port: int = 0):
+        self.config = uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="off")
+        self.server = uvicorn.Server(self.config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        sock = self.server.servers[0].sockets[0]
+        host, port = sock.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
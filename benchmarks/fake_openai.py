@@ -0,0 +1,69 @@
+"""
+Local stand-in for the OpenAI chat completions endpoint.
+
+Answers every request after a configurable latency so the CrewAI pipelines can
+be exercised without paying for API calls. Streaming and non-streaming
+requests are both supported. `error_rate` makes a share of requests fail with
+`error_status` to test retry and error handling under load.
+
+Point the app at it with OPENAI_BASE_URL / OPENAI_API_BASE = <url>/v1.
+"""
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+def default_reply(body: dict) -> str:
+    """A plausible answer for each crew prompt, in the ReAct format CrewAI parses"""
+    prompt = " ".join(str(message.get("content", "")) for message in body.get("messages", []))
+    if "JSON object" in prompt:
+        return 'Final Answer: {}'
+    if "relevancy" in prompt.lower() or "score" in prompt.lower():
+        return "Final Answer: 8"
+    return "Final Answer: John Smith"
+
+
+def create_fake_openai(latency: float = 0.0, latency_jitter: float = 0.0, error_rate: float = 0.0,
+                       error_status: int = 500, reply=default_reply):
+    """Build a fake OpenAI app answering after `latency` (+/- `latency_jitter`) seconds"""
+    app = FastAPI(title="Fake OpenAI")
+    app.state.calls = []
+    app.state.request_counts = {"chat": 0, "errors": 0}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.calls.append(body)
+        app.state.request_counts["chat"] += 1
+        await asyncio.sleep(max(0.0, latency + random.uniform(-latency_jitter, latency_jitter)))
+        if error_rate and random.random() < error_rate:
+            app.state.request_counts["errors"] += 1
+            return JSONResponse({"error": {"message": "Injected failure", "type": "server_error"}},
+                                status_code=error_status,
+                                headers={"Retry-After": "1"} if error_status == 429 else None)
+
+        content = reply(body)
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "created": int(time.time()), "model": body.get("model")}
+        if body.get("stream"):
+            async def chunks():
+                delta = {"role": "assistant", "content": content}
+                yield "data: " + json.dumps({**base, "object": "chat.completion.chunk",
+                                             "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+                yield "\n\n"
+                yield "data: " + json.dumps({**base, "object": "chat.completion.chunk",
+                                             "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+                yield "\n\ndata: [DONE]\n\n"
+            return StreamingResponse(chunks(), media_type="text/event-stream")
+        return {
+            **base,
+            "object": "chat.completion",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+
+    return app
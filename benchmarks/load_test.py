@@ -0,0 +1,298 @@
+"""
+Load test of app_fastapi:app against local AssemblyAI and OpenAI stand-ins.
+
+Runs the app in a uvicorn subprocess (working directory: a scratch directory)
+and drives each scenario at increasing concurrency with a closed loop of
+clients. For every scenario and concurrency level it reports p50/p95/p99
+latency, requests per second, errors and the app's peak RSS (Linux), and
+writes the results to benchmarks/results/<timestamp>.json. Pass --compare with
+an earlier results file to see the change per row; the exit status is 1 when
+throughput or p95 latency regressed by more than --regression-threshold.
+
+    python benchmarks/load_test.py --concurrency 1 4 16 --requests 48
+    python benchmarks/load_test.py --openai-latency 0.8 --openai-error-rate 0.05 --scenarios process-qna
+    python benchmarks/load_test.py --compare benchmarks/results/20260101_120000.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from datetime import datetime
+
+import httpx
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+sys.path.insert(0, BENCH_DIR)
+
+from fake_assemblyai import BackgroundServer, create_fake_assemblyai
+from fake_openai import create_fake_openai
+
+RESULTS_VERSION = 1
+
+
+def recording(seconds: float = 1.0, rate: int = 16000) -> bytes:
+    """A short WAV with a tone and random noise, so every request carries distinct audio"""
+    t = np.arange(int(seconds * rate)) / rate
+    samples = 0.3 * np.sin(2 * np.pi * 220 * t) + np.random.normal(0, 0.01, len(t))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes((samples * 32767).astype(np.int16).tobytes())
+    return buffer.getvalue()
+
+
+async def transcribe_form(client: httpx.AsyncClient, i: int) -> httpx.Response:
+    return await client.post("/api/transcribe-form",
+                             data={"field_name": "Inspector Name", "field_id": "inspector_name", "language": "en"},
+                             files={"audio_file": ("recording.wav", recording(), "audio/wav")})
+
+
+async def transcribe_qna(client: httpx.AsyncClient, i: int) -> httpx.Response:
+    return await client.post("/api/transcribe-qna", data={"language": "en"},
+                             files={"audio_file": ("recording.wav", recording(), "audio/wav")})
+
+
+async def process_qna(client: httpx.AsyncClient, i: int) -> httpx.Response:
+    return await client.post("/api/process-qna", data={
+        "question": "Can you describe the key features of the property?",
+        "answer": f"It has three bedrooms, a new roof and a renovated kitchen. Answer {i} {time.time_ns()}.",
+        "language_code": "en",
+    })
+
+
+async def save_form(client: httpx.AsyncClient, i: int) -> httpx.Response:
+    return await client.post("/api/save-form", json={
+        "Inspector Name": f"Inspector {i % 7}",
+        "Inspection Company": "Acme Inspections",
+        "Property Address": f"{100 + i} Main Street",
+        "Inspection Date": "2026-03-05",
+    })
+
+
+async def save_qna(client: httpx.AsyncClient, i: int) -> httpx.Response:
+    return await client.post("/api/save-qna", json={"questions_and_answers": [{
+        "question_number": 1,
+        "question": "Can you describe the key features of the property?",
+        "transcribed_text": f"Three bedrooms and a new roof ({i}).",
+        "ai_analysis": "Describes the layout and upgrades.",
+        "relevancy_score": "8",
+    }]})
+
+
+SCENARIOS = {
+    "transcribe-form": transcribe_form,
+    "transcribe-qna": transcribe_qna,
+    "process-qna": process_qna,
+    "save-form": save_form,
+    "save-qna": save_qna,
+}
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+
+def proc_status_mb(pid: int, field: str) -> float:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def reset_peak_rss(pid: int):
+    """Restart VmHWM tracking so each level reports its own peak (Linux 4.0+)"""
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+async def run_level(url: str, scenario, concurrency: int, requests: int) -> dict:
+    latencies, errors = [], []
+    pending = iter(range(requests))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=300, limits=limits) as client:
+        async def client_loop():
+            for i in pending:
+                start = time.perf_counter()
+                try:
+                    response = await scenario(client, i)
+                    if response.status_code >= 400:
+                        errors.append(f"{response.status_code}: {response.text[:120]}")
+                        continue
+                except httpx.HTTPError as e:
+                    errors.append(repr(e))
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[client_loop() for _ in range(concurrency)])
+        wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": len(errors),
+        "error_samples": errors[:3],
+        "rps": round(len(latencies) / wall, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url: str, proc: subprocess.Popen, warmup: bool, timeout: float = 120.0):
+    """Wait for the app to serve, and with the AI warmup on for it to finish, so no level pays for cold start"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("app exited during startup")
+        try:
+            config = httpx.get(f"{url}/api/config", timeout=1).json()
+            if not warmup or config.get("ai_ready", True):
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("app did not start")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: dict, baseline_path: str, threshold: float) -> bool:
+    """Print the change against an earlier run; returns True when something regressed"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(row["scenario"], row["concurrency"]): row for row in baseline["results"]}
+    regressed = False
+    print(f"\ncompared with {baseline_path} (commit {baseline.get('git_commit')})")
+    print(f"{'scenario':16s} {'conc':>4s} {'rps':>16s} {'p95 ms':>20s}")
+    for row in results["results"]:
+        old = previous.get((row["scenario"], row["concurrency"]))
+        if old is None or not old["rps"] or not old["p95_ms"] or row["p95_ms"] is None:
+            continue
+        rps_change = row["rps"] / old["rps"] - 1
+        p95_change = row["p95_ms"] / old["p95_ms"] - 1
+        flag = rps_change < -threshold or p95_change > threshold
+        regressed |= flag
+        print(f"{row['scenario']:16s} {row['concurrency']:4d} {old['rps']:6.1f} -> {row['rps']:6.1f} "
+              f"{old['p95_ms']:8.0f} -> {row['p95_ms']:8.0f} ({rps_change:+.0%} rps, {p95_change:+.0%} p95)"
+              f"{'  REGRESSION' if flag else ''}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=48, help="Requests per scenario and concurrency level")
+    parser.add_argument("--assemblyai-processing-time", type=float, default=1.0)
+    parser.add_argument("--assemblyai-latency", type=float, default=0.02)
+    parser.add_argument("--assemblyai-error-rate", type=float, default=0.0)
+    parser.add_argument("--openai-latency", type=float, default=0.5)
+    parser.add_argument("--openai-latency-jitter", type=float, default=0.1)
+    parser.add_argument("--openai-error-rate", type=float, default=0.0)
+    parser.add_argument("--app-env", nargs="*", default=[], metavar="KEY=VALUE",
+                        help="Extra environment for the app process, e.g. JOB_WORKERS=8")
+    parser.add_argument("--output", help="Results file (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--regression-threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    fake_assemblyai = create_fake_assemblyai(
+        processing_time=args.assemblyai_processing_time, request_latency=args.assemblyai_latency,
+        error_rate=args.assemblyai_error_rate, vary_text=True,
+    )
+    fake_openai = create_fake_openai(latency=args.openai_latency, latency_jitter=args.openai_latency_jitter,
+                                     error_rate=args.openai_error_rate)
+    rows = []
+    with BackgroundServer(fake_assemblyai) as assemblyai, BackgroundServer(fake_openai) as openai, \
+            tempfile.TemporaryDirectory() as workdir:
+        port = free_port()
+        env = dict(os.environ, ASSEMBLYAI_BASE_URL=assemblyai.url, ASSEMBLYAI_API_KEY="test-key",
+                   OPENAI_API_KEY="test-key", OPENAI_BASE_URL=f"{openai.url}/v1", OPENAI_API_BASE=f"{openai.url}/v1",
+                   SESSION_DB=os.path.join(workdir, "sessions.db"))
+        env.update(item.split("=", 1) for item in args.app_env)
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app_fastapi:app", "--app-dir", ROOT, "--port", str(port),
+             "--log-level", "warning"],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL,
+        )
+        url = f"http://127.0.0.1:{port}"
+        try:
+            wait_until_up(url, proc, env.get("AI_WARMUP", "true").lower() == "true")
+            print(f"app started, RSS {proc_status_mb(proc.pid, 'VmRSS'):.1f} MB")
+            print(f"{'scenario':16s} {'conc':>4s} {'rps':>7s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} "
+                  f"{'errors':>6s} {'peak MB':>8s}")
+            for name in args.scenarios:
+                for concurrency in args.concurrency:
+                    reset_peak_rss(proc.pid)
+                    row = asyncio.run(run_level(url, SCENARIOS[name], concurrency, args.requests))
+                    row = {"scenario": name, "concurrency": concurrency, **row,
+                           "peak_rss_mb": round(proc_status_mb(proc.pid, "VmHWM"), 1)}
+                    rows.append(row)
+                    print(f"{name:16s} {concurrency:4d} {row['rps']:7.2f} {row['p50_ms'] or 0:8.0f} "
+                          f"{row['p95_ms'] or 0:8.0f} {row['p99_ms'] or 0:8.0f} {row['errors']:6d} "
+                          f"{row['peak_rss_mb']:8.1f}")
+                    for sample in row["error_samples"]:
+                        print(f"    {sample}")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    results = {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": rows,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nresults written to {output}")
+
+    if args.compare and compare(results, args.compare, args.regression_threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,13 @@ let formFields = [];
 let customFields = [];
 let fieldValues = {};
 let currentRecordingField = null;
+let dictatingWholeForm = false;
 let mediaRecorder = null;
 let audioChunks = [];
 let recordedBlob = null;
 let selectedLanguage = 'auto';
+let liveMode = false;
+let liveTranscriber = null;
 
 // =====================================================================================
 // INITIALIZATION
@@ -54,6 +57,10 @@ function setupEventListeners() {
     document.getElementById('resetFieldsBtn').addEventListener('click', resetFields);
     document.getElementById('saveFormBtn').addEventListener('click', saveForm);
     document.getElementById('clearFormBtn').addEventListener('click', clearForm);
+    document.getElementById('dictateFormBtn').addEventListener('click', startWholeFormDictation);
+    document.getElementById('liveModeToggle').addEventListener('change', (e) => {
+        liveMode = e.target.checked;
+    });
     
     // Modal event listeners
     document.getElementById('stopRecordingBtn').addEventListener('click', stopRecording);
@@ -193,10 +200,21 @@ function updatePreview() {
 // AUDIO RECORDING
 // =====================================================================================
 
+function startWholeFormDictation() {
+    dictatingWholeForm = true;
+    startRecording(null);
+}
+
 async function startRecording(field) {
     currentRecordingField = field;
+    dictatingWholeForm = field === null;
     audioChunks = [];
     
+    if (liveMode) {
+        await startLiveRecording();
+        return;
+    }
+    
     try {
         const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
         mediaRecorder = new MediaRecorder(stream);
@@ -225,6 +243,12 @@ async function startRecording(field) {
 }
 
 function stopRecording() {
+    if (liveTranscriber) {
+        liveTranscriber.stop();
+        hideRecordingModal();
+        showProcessingModal(dictatingWholeForm ? 'Extracting all fields...' : 'Extracting...');
+        return;
+    }
     if (mediaRecorder && mediaRecorder.state === 'recording') {
         mediaRecorder.stop();
     }
@@ -233,6 +257,7 @@ function stopRecording() {
 
 function showRecordingModal() {
     const modal = document.getElementById('recordingModal');
+    document.getElementById('livePartial').textContent = '';
     modal.classList.add('show');
 }
 
@@ -245,6 +270,8 @@ function showConfirmModal() {
     const modal = document.getElementById('confirmModal');
     const audio = document.getElementById('audioPlayback');
     audio.src = URL.createObjectURL(recordedBlob);
+    document.getElementById('confirmRecordBtn').textContent =
+        dictatingWholeForm ? '✅ Confirm & Fill All Fields' : '✅ Confirm & Fill Field';
     modal.classList.add('show');
 }
 
@@ -260,11 +287,60 @@ function reRecord() {
     startRecording(currentRecordingField);
 }
 
+// =====================================================================================
+// LIVE RECORDING
+// =====================================================================================
+
+async function startLiveRecording() {
+    const options = dictatingWholeForm
+        ? { mode: 'form-multi', fields: formFields.map(f => ({ id: f.id, name: f.name })) }
+        : { mode: 'form', field_name: currentRecordingField.name, field_id: currentRecordingField.id };
+    
+    liveTranscriber = new LiveTranscriber({
+        onPartial: (text) => {
+            document.getElementById('livePartial').textContent = text;
+        },
+        onResult: (result) => {
+            liveTranscriber = null;
+            hideProcessingModal();
+            if (dictatingWholeForm) {
+                applyWholeFormResult(result);
+                dictatingWholeForm = false;
+            } else {
+                applyFieldResult(result);
+                currentRecordingField = null;
+            }
+        },
+        onError: (error) => {
+            liveTranscriber = null;
+            hideRecordingModal();
+            hideProcessingModal();
+            console.error('Live transcription error:', error);
+            alert('Error: ' + error.message);
+        }
+    });
+    
+    try {
+        await liveTranscriber.start({ ...options, language: selectedLanguage });
+        showRecordingModal();
+    } catch (error) {
+        liveTranscriber.finish();
+        liveTranscriber = null;
+        console.error('Error starting live transcription:', error);
+        alert('Could not start live transcription: ' + error.message);
+    }
+}
+
 // =====================================================================================
 // API CALLS
 // =====================================================================================
 
 async function confirmRecording() {
+    if (dictatingWholeForm) {
+        await confirmWholeFormRecording();
+        return;
+    }
+    
     hideConfirmModal();
     showProcessingModal('Transcribing audio...');
     
@@ -272,6 +348,7 @@ async function confirmRecording() {
         const formData = new FormData();
         formData.append('audio_file', recordedBlob, 'recording.wav');
         formData.append('field_name', currentRecordingField.name);
+        formData.append('field_id', currentRecordingField.id);
         formData.append('language', selectedLanguage);
         
         const response = await fetch('/api/transcribe-form', {
@@ -288,17 +365,43 @@ async function confirmRecording() {
         
         updateProcessingModal('Translating and extracting...');
         
-        // Update field value
-        fieldValues[currentRecordingField.id] = result.field_value;
+        hideProcessingModal();
+        applyFieldResult(result);
         
+    } catch (error) {
         hideProcessingModal();
+        console.error('Error processing recording:', error);
+        alert('Error: ' + error.message);
+    }
+    
+    currentRecordingField = null;
+    recordedBlob = null;
+}
+
+async function confirmWholeFormRecording() {
+    hideConfirmModal();
+    showProcessingModal('Transcribing and extracting all fields...');
+    
+    try {
+        const formData = new FormData();
+        formData.append('audio_file', recordedBlob, 'recording.wav');
+        formData.append('fields', JSON.stringify(formFields.map(f => ({ id: f.id, name: f.name }))));
+        formData.append('language', selectedLanguage);
         
-        // Show success message
-        alert(`✅ Field "${currentRecordingField.name}" filled successfully!\n\nTranscribed: "${result.transcription}"\nExtracted: "${result.field_value}"`);
+        const response = await fetch('/api/transcribe-form-multi', {
+            method: 'POST',
+            body: formData
+        });
         
-        // Re-render
-        renderFields();
-        updatePreview();
+        if (!response.ok) {
+            const error = await response.json();
+            throw new Error(error.detail || 'Transcription failed');
+        }
+        
+        const result = await response.json();
+        
+        hideProcessingModal();
+        applyWholeFormResult(result);
         
     } catch (error) {
         hideProcessingModal();
@@ -306,10 +409,39 @@ async function confirmRecording() {
         alert('Error: ' + error.message);
     }
     
-    currentRecordingField = null;
+    dictatingWholeForm = false;
     recordedBlob = null;
 }
 
+function applyFieldResult(result) {
+    // Update field value
+    fieldValues[currentRecordingField.id] = result.field_value;
+    
+    // Show success message
+    alert(`✅ Field "${currentRecordingField.name}" filled successfully!\n\nTranscribed: "${result.transcription}"\nExtracted: "${result.field_value}"`);
+    
+    // Re-render
+    renderFields();
+    updatePreview();
+}
+
+function applyWholeFormResult(result) {
+    // Only overwrite fields the recording actually mentioned
+    const filled = [];
+    formFields.forEach(field => {
+        const extracted = result.fields[field.id];
+        if (extracted && extracted.value) {
+            fieldValues[field.id] = extracted.value;
+            filled.push(`${field.name}: "${extracted.value}" (${Math.round(extracted.confidence * 100)}%)`);
+        }
+    });
+    
+    alert(`✅ Filled ${filled.length} of ${formFields.length} fields\n\nTranscribed: "${result.transcription}"\n\n${filled.join('\n')}`);
+    
+    renderFields();
+    updatePreview();
+}
+
 // =====================================================================================
 // PROCESSING MODAL
 // =====================================================================================
@@ -0,0 +1,119 @@
+// =====================================================================================
+// LIVE TRANSCRIPTION
+// =====================================================================================
+// Streams microphone audio to /ws/transcribe-live as 16 kHz PCM while the user
+// speaks. Partial transcripts come back immediately and the extraction/analysis
+// result arrives right after the final transcript.
+
+const LIVE_SAMPLE_RATE = 16000;
+
+class LiveTranscriber {
+    constructor({ onPartial, onTranscript, onResult, onError }) {
+        this.onPartial = onPartial || (() => {});
+        this.onTranscript = onTranscript || (() => {});
+        this.onResult = onResult || (() => {});
+        this.onError = onError || (() => {});
+        this.finalText = '';
+        this.finished = false;
+    }
+
+    async start(options) {
+        this.stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+
+        const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+        this.socket = new WebSocket(`${protocol}://${window.location.host}/ws/transcribe-live`);
+        this.socket.binaryType = 'arraybuffer';
+        await new Promise((resolve, reject) => {
+            this.socket.onopen = resolve;
+            this.socket.onerror = () => reject(new Error('Could not connect to live transcription'));
+        });
+        this.socket.onmessage = (event) => this.handleMessage(JSON.parse(event.data));
+        this.socket.onclose = () => {
+            if (!this.finished) {
+                this.finish();
+                this.onError(new Error('Live transcription connection closed'));
+            }
+        };
+        this.socket.send(JSON.stringify({ type: 'start', sample_rate: LIVE_SAMPLE_RATE, ...options }));
+
+        this.audioContext = new AudioContext();
+        const source = this.audioContext.createMediaStreamSource(this.stream);
+        this.processor = this.audioContext.createScriptProcessor(4096, 1, 1);
+        this.processor.onaudioprocess = (event) => {
+            if (this.socket.readyState === WebSocket.OPEN) {
+                const samples = event.inputBuffer.getChannelData(0);
+                this.socket.send(downsampleToPcm16(samples, this.audioContext.sampleRate));
+            }
+        };
+        source.connect(this.processor);
+        this.processor.connect(this.audioContext.destination);
+    }
+
+    stop() {
+        this.releaseMicrophone();
+        if (this.socket && this.socket.readyState === WebSocket.OPEN) {
+            this.socket.send(JSON.stringify({ type: 'stop' }));
+        }
+    }
+
+    releaseMicrophone() {
+        if (this.processor) {
+            this.processor.disconnect();
+            this.processor = null;
+        }
+        if (this.audioContext) {
+            this.audioContext.close();
+            this.audioContext = null;
+        }
+        if (this.stream) {
+            this.stream.getTracks().forEach(track => track.stop());
+            this.stream = null;
+        }
+    }
+
+    finish() {
+        this.finished = true;
+        this.releaseMicrophone();
+    }
+
+    handleMessage(message) {
+        switch (message.type) {
+            case 'partial':
+                this.onPartial(`${this.finalText} ${message.text}`.trim());
+                break;
+            case 'final':
+                this.finalText = `${this.finalText} ${message.text}`.trim();
+                this.onPartial(this.finalText);
+                break;
+            case 'transcript':
+                this.onTranscript(message);
+                break;
+            case 'result':
+                this.finish();
+                this.onResult(message);
+                break;
+            case 'error':
+                this.finish();
+                this.onError(new Error(message.detail));
+                break;
+        }
+    }
+}
+
+function downsampleToPcm16(samples, inputRate) {
+    // Average the input samples that fall into each 16 kHz output sample
+    const ratio = inputRate / LIVE_SAMPLE_RATE;
+    const length = Math.floor(samples.length / ratio);
+    const pcm = new Int16Array(length);
+    for (let i = 0; i < length; i++) {
+        const start = Math.floor(i * ratio);
+        const end = Math.min(samples.length, Math.floor((i + 1) * ratio));
+        let sum = 0;
+        for (let j = start; j < end; j++) {
+            sum += samples[j];
+        }
+        const sample = Math.max(-1, Math.min(1, sum / Math.max(1, end - start)));
+        pcm[i] = sample < 0 ? sample * 0x8000 : sample * 0x7FFF;
+    }
+    return pcm.buffer;
+}
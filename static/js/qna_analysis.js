@@ -13,6 +13,11 @@ let mediaRecorder = null;
 let audioChunks = [];
 let recordedBlob = null;
 let currentAudioFileId = null;
+let liveMode = false;
+let liveTranscriber = null;
+
+// Answers recorded but not yet processed, submitted together as one batch
+let queuedRecordings = {};
 
 // Current question state
 let currentTranscription = null;
@@ -64,10 +69,15 @@ function setupEventListeners() {
     document.getElementById('clearCustomBtn').addEventListener('click', clearCustomQuestions);
     
     // Recording workflow (simplified like form filler)
+    document.getElementById('liveModeToggle').addEventListener('change', (e) => {
+        liveMode = e.target.checked;
+    });
     document.getElementById('recordAnswerBtn').addEventListener('click', startRecording);
     document.getElementById('stopRecordingBtn').addEventListener('click', stopRecording);
     document.getElementById('confirmRecordBtn').addEventListener('click', confirmAndProcess);
     document.getElementById('reRecordBtn').addEventListener('click', reRecord);
+    document.getElementById('queueRecordBtn').addEventListener('click', queueRecording);
+    document.getElementById('submitAllBtn').addEventListener('click', submitAllAnswers);
     document.getElementById('reRecordAnswerBtn').addEventListener('click', reRecordFromAnalysis);
     document.getElementById('saveAnswerBtn').addEventListener('click', saveAnswer);
     
@@ -95,7 +105,7 @@ function renderQuestions() {
         
         const isPredefined = index < 3; // First 3 are predefined
         const icon = isPredefined ? '🔖' : '✨';
-        const status = answers[index] ? '✅' : '⭕';
+        const status = answers[index] ? '✅' : (queuedRecordings[index] ? '⏳' : '⭕');
         
         btn.innerHTML = `${status} ${icon} ${question}`;
         
@@ -106,6 +116,10 @@ function renderQuestions() {
         btn.addEventListener('click', () => selectQuestion(index));
         container.appendChild(btn);
     });
+    
+    const queuedCount = Object.keys(queuedRecordings).length;
+    document.getElementById('queuedCount').textContent = queuedCount;
+    document.getElementById('submitAllBtn').style.display = queuedCount > 0 ? 'block' : 'none';
 }
 
 function selectQuestion(index) {
@@ -159,6 +173,9 @@ function clearCustomQuestions() {
     // Remove custom questions
     allQuestions = allQuestions.slice(0, 3); // Keep only predefined
     customQuestions = [];
+    Object.keys(queuedRecordings)
+        .filter(index => parseInt(index) >= allQuestions.length)
+        .forEach(index => delete queuedRecordings[index]);
     
     // Reset to first question if needed
     if (selectedQuestionIndex >= allQuestions.length) {
@@ -251,6 +268,11 @@ function findNextUnanswered() {
 async function startRecording() {
     audioChunks = [];
     
+    if (liveMode) {
+        await startLiveRecording();
+        return;
+    }
+    
     try {
         const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
         mediaRecorder = new MediaRecorder(stream);
@@ -279,6 +301,12 @@ async function startRecording() {
 }
 
 function stopRecording() {
+    if (liveTranscriber) {
+        liveTranscriber.stop();
+        hideRecordingModal();
+        showProcessingModal('Analyzing with AI...');
+        return;
+    }
     if (mediaRecorder && mediaRecorder.state === 'recording') {
         mediaRecorder.stop();
     }
@@ -287,6 +315,7 @@ function stopRecording() {
 
 function showRecordingModal() {
     const modal = document.getElementById('recordingModal');
+    document.getElementById('livePartial').textContent = '';
     modal.classList.add('show');
 }
 
@@ -372,7 +401,8 @@ async function confirmAndProcess() {
         const processFormData = new FormData();
         processFormData.append('question', currentQuestion);
         processFormData.append('answer', currentEnglishText || currentTranscription);
-        processFormData.append('language_code', currentLanguageCode || 'en');
+        // english_text is already translated, so only an untranslated transcription keeps its language
+        processFormData.append('language_code', currentEnglishText ? 'en' : (currentLanguageCode || 'en'));
         
         const processResponse = await fetch('/api/process-qna', {
             method: 'POST',
@@ -386,15 +416,8 @@ async function confirmAndProcess() {
         
         const processResult = await processResponse.json();
         
-        currentAnalysis = processResult.summary;
-        currentRelevancyScore = processResult.relevancy_score;
-        
         hideProcessingModal();
-        
-        // Show analysis section
-        document.getElementById('aiAnalysis').innerHTML = currentAnalysis;
-        document.getElementById('qualityScore').innerHTML = currentRelevancyScore;
-        document.getElementById('analysisSection').style.display = 'block';
+        showAnalysis(processResult);
         
     } catch (error) {
         hideProcessingModal();
@@ -403,6 +426,60 @@ async function confirmAndProcess() {
     }
 }
 
+function showAnalysis(result) {
+    currentAnalysis = result.summary;
+    currentRelevancyScore = result.relevancy_score;
+    
+    // Show analysis section
+    document.getElementById('aiAnalysis').innerHTML = currentAnalysis;
+    document.getElementById('qualityScore').innerHTML = currentRelevancyScore;
+    document.getElementById('analysisSection').style.display = 'block';
+}
+
+async function startLiveRecording() {
+    // Live answers are transcribed and analyzed over one socket, so there is
+    // no uploaded recording to keep or retry
+    recordedBlob = null;
+    currentAudioFileId = null;
+    
+    liveTranscriber = new LiveTranscriber({
+        onPartial: (text) => {
+            document.getElementById('livePartial').textContent = text;
+        },
+        onResult: (result) => {
+            liveTranscriber = null;
+            currentTranscription = result.transcription;
+            currentLanguageCode = result.language_code;
+            currentConfidence = null;
+            currentEnglishText = result.english_text;
+            document.getElementById('answerText').value = currentTranscription;
+            hideProcessingModal();
+            showAnalysis(result);
+        },
+        onError: (error) => {
+            liveTranscriber = null;
+            hideRecordingModal();
+            hideProcessingModal();
+            console.error('Live transcription error:', error);
+            alert('Error: ' + error.message);
+        }
+    });
+    
+    try {
+        await liveTranscriber.start({
+            mode: 'qna',
+            question: allQuestions[selectedQuestionIndex],
+            language: selectedLanguage
+        });
+        showRecordingModal();
+    } catch (error) {
+        liveTranscriber.finish();
+        liveTranscriber = null;
+        console.error('Error starting live transcription:', error);
+        alert('Could not start live transcription: ' + error.message);
+    }
+}
+
 function showProcessingModal(text) {
     const modal = document.getElementById('processingModal');
     document.getElementById('processingText').textContent = text;
@@ -418,6 +495,110 @@ function hideProcessingModal() {
     modal.classList.remove('show');
 }
 
+// =====================================================================================
+// BATCH SUBMISSION
+// =====================================================================================
+
+function queueRecording() {
+    hideConfirmModal();
+    queuedRecordings[selectedQuestionIndex] = recordedBlob;
+    recordedBlob = null;
+    audioChunks = [];
+    
+    // Move on to the next question that has neither an answer nor a queued recording
+    const next = allQuestions.findIndex((_, i) => !answers[i] && !queuedRecordings[i]);
+    if (next !== -1) {
+        selectedQuestionIndex = next;
+        resetCurrentQuestionState();
+        renderCurrentQuestion();
+    }
+    renderQuestions();
+}
+
+async function submitAllAnswers() {
+    const queued = Object.entries(queuedRecordings);
+    if (!queued.length) {
+        return;
+    }
+    
+    const formData = new FormData();
+    const items = queued.map(([index, blob], position) => {
+        formData.append('audio_files', blob, `answer_${index}.wav`);
+        return { index: parseInt(index), question: allQuestions[index], audio_index: position };
+    });
+    formData.append('items', JSON.stringify(items));
+    formData.append('language', selectedLanguage);
+    
+    let completed = 0;
+    const failures = [];
+    showProcessingModal(`Processing ${items.length} answers... (0/${items.length})`);
+    
+    try {
+        const response = await fetch('/api/process-qna-batch', {
+            method: 'POST',
+            body: formData
+        });
+        
+        if (!response.ok) {
+            const error = await response.json();
+            throw new Error(error.detail || 'Batch processing failed');
+        }
+        
+        // Results arrive as NDJSON, one line per answer as soon as it is done
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            
+            lines.filter(line => line.trim()).forEach(line => {
+                const result = JSON.parse(line);
+                completed++;
+                if (result.status === 'success') {
+                    const blob = queuedRecordings[result.index];
+                    answers[result.index] = {
+                        question: result.question,
+                        transcription: result.transcription,
+                        english_converted_text: result.english_text || result.transcription,
+                        ai_analysis: result.summary,
+                        relevancy_score: result.relevancy_score,
+                        language_code: result.language_code,
+                        transcription_confidence: result.confidence,
+                        audio_file: blob ? URL.createObjectURL(blob) : null
+                    };
+                    delete queuedRecordings[result.index];
+                } else {
+                    failures.push(`Question ${result.index + 1}: ${result.detail}`);
+                }
+                updateProcessingModal(`Processing ${items.length} answers... (${completed}/${items.length})`);
+                renderQuestions();
+            });
+        }
+        
+        hideProcessingModal();
+        resetCurrentQuestionState();
+        renderCurrentQuestion();
+        
+        if (failures.length) {
+            alert(`⚠️ ${failures.length} answer(s) failed and are still queued:\n\n${failures.join('\n')}`);
+        } else {
+            alert(`✅ All ${items.length} answers processed!`);
+        }
+        
+    } catch (error) {
+        hideProcessingModal();
+        console.error('Error submitting answers:', error);
+        alert('Error: ' + error.message);
+    }
+}
+
 // =====================================================================================
 // SAVE ANSWER
 // =====================================================================================
@@ -534,6 +715,8 @@ function createExpandable(title, content) {
 
 async function saveQnAAnalysis() {
     const qnaData = {
+        property_address: document.getElementById('propertyAddressInput').value.trim() || null,
+        inspector_name: document.getElementById('inspectorNameInput').value.trim() || null,
         questions_and_answers: []
     };
     
@@ -575,6 +758,7 @@ function startNewSession() {
     }
     
     answers = {};
+    queuedRecordings = {};
     selectedQuestionIndex = 0;
     resetCurrentQuestionState();
     
@@ -0,0 +1,14 @@
+import pytest
+
+from deadline_scenarios import SCENARIOS
+from fake_assemblyai import BackgroundServer, create_fake_assemblyai
+from fake_openai import create_fake_openai
+
+
+# Each scenario runs the app in a uvicorn subprocess against slow or stuck fakes and returns its problems
+@pytest.mark.parametrize("scenario, assemblyai_options, openai_options", SCENARIOS,
+                         ids=[scenario.__name__ for scenario, _, _ in SCENARIOS])
+def test_deadline_scenario(scenario, assemblyai_options, openai_options):
+    with BackgroundServer(create_fake_assemblyai(**assemblyai_options)) as assemblyai, \
+            BackgroundServer(create_fake_openai(**openai_options)) as openai:
+        assert scenario(assemblyai, openai) == []
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app_fastapi import fast_path_extract
+
+TODAY = datetime.now()
+
+
+@pytest.mark.parametrize("field_name, text, expected", [
+    # Spelled-out numbers are only trusted when they are the whole answer
+    ("Year Built", "nineteen ninety eight", "1998"),
+    ("Year Built", "built in nineteen ninety eight", None),
+    ("Year Built", "built in 1998", "1998"),
+    ("Number of Bathrooms", "two and a half baths", None),
+    ("Number of Bedrooms", "three hundred and twenty five", "325"),
+    ("Number of Bedrooms", "two three", None),
+    ("Square Feet", "about 1,250 square feet", "1250"),
+    # A number followed by a comma still counts towards the ambiguity check
+    ("Year Built", "built 1998, renovated 2010", None),
+    ("Number of Bedrooms", "3, maybe 4", None),
+    ("Number of Bedrooms", "3, I think", "3"),
+    # Identifiers are not quantities
+    ("License Number", "ABC 1234", None),
+    ("Invoice Number", "INV 5531", None),
+    # today/tomorrow/yesterday only stand alone, not as the anchor of another date
+    ("Inspection Date", "two weeks from today", None),
+    ("Inspection Date", "the day after tomorrow", None),
+    ("Inspection Date", "today", TODAY.strftime("%Y-%m-%d")),
+    ("Inspection Date", "tomorrow morning", (TODAY + timedelta(days=1)).strftime("%Y-%m-%d")),
+    ("Inspection Date", "March fifth twenty twenty six", "2026-03-05"),
+    # A street followed by text that isn't a locality is left to the LLM
+    ("Property Address", "123 Main Street in Springfield, Illinois", None),
+    ("Property Address", "1600 Pennsylvania Avenue NW, Washington, DC 20500",
+     "1600 Pennsylvania Avenue NW, Washington, DC 20500"),
+    ("Property Address", "It's at 123 Main Street.", "123 Main Street"),
+    ("Property Address", "42 Oak Lane, Apt 4, Portland, Oregon 97201", "42 Oak Lane, Apt 4, Portland, Oregon 97201"),
+])
+def test_fast_path_extract(field_name, text, expected):
+    assert fast_path_extract(field_name, text) == expected
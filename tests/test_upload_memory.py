@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+from bench_upload_memory import measure_peaks
+
+
+# VmHWM and its reset through clear_refs are Linux-only
+@pytest.mark.skipif(not sys.platform.startswith("linux") or not os.path.exists("/proc/self/clear_refs"),
+                    reason="needs /proc peak RSS tracking")
+def test_peak_memory_does_not_grow_with_recording_length():
+    # A 10-minute 48 kHz stereo WAV is about 110 MB; buffering it anywhere would show up many times over
+    peaks = measure_peaks([1, 10])
+    assert peaks[-1] - peaks[0] < 40